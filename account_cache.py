@@ -0,0 +1,152 @@
+"""
+Account snapshot kept fresh by a background refresher.
+
+Risk sizing reads balance/equity/free margin from the snapshot instead of
+calling mt5.account_info() on every signal. A snapshot older than max_age is
+refreshed synchronously before it is used. For a while after the bot places
+orders (see watch_fills()) the refresher also polls the bot's own positions and
+refreshes as soon as one opens (a limit filled) or closes, since that is when
+balance and margin move. With no orders outstanding it stays off the MT5
+worker between the regular refreshes.
+"""
+
+import threading
+import time
+
+from bot_logging import get_logger
+
+log = get_logger("account_cache")
+
+# Sizing basis name -> MT5 AccountInfo field
+SIZING_BASIS_FIELDS = {
+    "balance": "balance",
+    "equity": "equity",
+    "margin": "margin_free",
+}
+
+
+class AccountCache:
+    """Thread-safe cache of the latest mt5.account_info() result."""
+
+    def __init__(
+        self,
+        fetch_account,
+        refresh_interval=5.0,
+        max_age=15.0,
+        fetch_positions=None,
+        fill_poll_interval=1.0,
+        fill_watch=300.0,
+    ):
+        # fetch_account() returns an AccountInfo-like object or None
+        self.fetch_account = fetch_account
+        self.refresh_interval = refresh_interval
+        self.max_age = max_age
+        # fetch_positions() returns a comparable set of our open position tickets, or None
+        self.fetch_positions = fetch_positions
+        self.fill_poll_interval = fill_poll_interval
+        self.fill_watch = fill_watch
+        self._positions = None
+        self._watch_until = 0.0
+        self._refresh_requested = False
+
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._fetched_at = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def get(self):
+        """Return the account snapshot, refreshing it first if older than max_age."""
+        with self._lock:
+            snapshot, fetched_at = self._snapshot, self._fetched_at
+        if snapshot is not None and time.monotonic() - fetched_at <= self.max_age:
+            return snapshot
+        return self.refresh()
+
+    def sizing_value(self, basis="balance"):
+        """Return the balance, equity or free margin to size against, or None."""
+        snapshot = self.get()
+        if snapshot is None:
+            return None
+        return getattr(snapshot, SIZING_BASIS_FIELDS.get(basis, "balance"))
+
+    def age(self):
+        """Seconds since the last refresh, or None if never refreshed."""
+        with self._lock:
+            fetched_at = self._fetched_at
+        return time.monotonic() - fetched_at if fetched_at is not None else None
+
+    def refresh(self):
+        """Fetch the account now and store it; returns the new snapshot (or None)."""
+        snapshot = self.fetch_account()
+        if snapshot is not None:
+            with self._lock:
+                self._snapshot = snapshot
+                self._fetched_at = time.monotonic()
+        return snapshot
+
+    def request_refresh(self):
+        """Ask the background refresher to refresh now."""
+        self._refresh_requested = True
+        self._wake.set()
+
+    def watch_fills(self):
+        """Poll our positions for fill_watch seconds, or until one opens or closes."""
+        if self.fetch_positions is None:
+            return
+        self._watch_until = max(self._watch_until, time.monotonic() + self.fill_watch)
+        self._wake.set()
+
+    def _watching(self):
+        # Until the first baseline of our positions is taken, a fill could not be told apart
+        return self.fetch_positions is not None and (
+            self._positions is None or time.monotonic() < self._watch_until
+        )
+
+    def _positions_changed(self):
+        """True when our open positions differ from the last check: a fill or a close."""
+        if self.fetch_positions is None:
+            return False
+        positions = self.fetch_positions()
+        if positions is None:
+            return False
+        changed = self._positions is not None and positions != self._positions
+        self._positions = positions
+        return changed
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="account-refresher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=self.refresh_interval + 1)
+
+    def _run(self):
+        due = 0.0
+        while not self._stop.is_set():
+            try:
+                changed = self._watching() and self._positions_changed()
+                if changed:
+                    # The placed orders started filling; the regular refresh covers the rest
+                    self._watch_until = 0.0
+                if changed or time.monotonic() >= due:
+                    self.refresh()
+                    due = time.monotonic() + self.refresh_interval
+            except Exception as e:
+                log.warning(f"Error refreshing account info: {str(e)}")
+
+            wait = max(0.0, due - time.monotonic())
+            if self._watching():
+                wait = min(wait, self.fill_poll_interval)
+            self._wake.wait(wait)
+            self._wake.clear()
+            if self._refresh_requested:
+                self._refresh_requested = False
+                due = 0.0
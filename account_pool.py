@@ -0,0 +1,233 @@
+"""
+Fan-out of signals to several MT5 accounts, one worker process per terminal.
+
+The MetaTrader5 package binds a process to a single terminal, so every
+configured account gets its own worker process that calls mt5.initialize()
+with the account's terminal path and login. The bot parses and resolves a
+signal once and builds the order requests; each worker sizes the ladder
+against its own account and its own broker's contract spec (tick value is in
+the account's deposit currency, volume limits differ between brokers) and
+sends the orders.
+
+Workers are started as `python account_pool.py` and exchange JSON lines over
+stdin/stdout rather than through multiprocessing, which would re-import
+main.py (and start a second bot) in every child.
+"""
+
+import asyncio
+import itertools
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import Future
+
+from bot_logging import get_logger
+
+log = get_logger("account_pool")
+
+# Keys of an account entry in config.json passed on to mt5.initialize()
+INITIALIZE_KEYS = ("login", "password", "server", "timeout", "portable")
+
+
+class AccountWorker:
+    """Parent-side handle of one account's worker process."""
+
+    def __init__(self, account):
+        self.account = account
+        self.name = account["name"]
+        self._ids = itertools.count(1)
+        self._pending = {}  # job id -> Future
+        self._lock = threading.Lock()
+        self._process = None
+        self._closing = False
+
+    def start(self):
+        self._process = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            bufsize=1,
+        )
+        # Credentials go over the pipe, not the command line
+        self._write(self.account)
+        threading.Thread(target=self._read, name=f"account-{self.name}", daemon=True).start()
+
+    def submit(self, plan):
+        """Send a plan to the worker; returns a Future of its result dict."""
+        future = Future()
+        with self._lock:
+            job_id = next(self._ids)
+            self._pending[job_id] = future
+        try:
+            self._write({"id": job_id, "plan": plan})
+        except Exception as e:
+            with self._lock:
+                self._pending.pop(job_id, None)
+            future.set_exception(RuntimeError(f"Worker for {self.name} is not running: {str(e)}"))
+        return future
+
+    def _write(self, message):
+        with self._lock:
+            self._process.stdin.write(json.dumps(message) + "\n")
+            self._process.stdin.flush()
+
+    def _read(self):
+        for line in self._process.stdout:
+            try:
+                reply = json.loads(line)
+            except ValueError:
+                log.warning(f"Unreadable reply from worker {self.name}: {line.strip()}")
+                continue
+            with self._lock:
+                future = self._pending.pop(reply.get("id"), None)
+            if future:
+                future.set_result(reply)
+
+        # The worker exited: fail whatever is still waiting on it
+        code = self._process.wait()
+        if not self._closing:
+            log.error(f"Worker for account {self.name} exited with code {code}")
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for future in pending.values():
+            future.set_exception(RuntimeError(f"Worker for {self.name} exited"))
+
+    def close(self, timeout=5.0):
+        if self._process is None:
+            return
+        self._closing = True
+        try:
+            self._process.stdin.close()
+            self._process.wait(timeout=timeout)
+        except Exception:
+            self._process.kill()
+
+
+class AccountPool:
+    """Worker processes for the accounts listed in config.json."""
+
+    def __init__(self, accounts):
+        self.accounts = [
+            {**account, "name": str(account.get("name") or account.get("login") or f"account{i + 1}")}
+            for i, account in enumerate(accounts)
+        ]
+        self.workers = {account["name"]: AccountWorker(account) for account in self.accounts}
+
+    def start(self):
+        for worker in self.workers.values():
+            worker.start()
+        log.info(f"Started workers for {len(self.workers)} accounts")
+
+    async def execute(self, plans):
+        """
+        Run one plan per account concurrently. Returns {name: result} where a
+        result has "results" (one dict per order) and "seconds", or "error".
+        """
+        names = list(plans)
+        futures = [asyncio.wrap_future(self.workers[name].submit(plans[name])) for name in names]
+        replies = await asyncio.gather(*futures, return_exceptions=True)
+        return {
+            name: {"error": str(reply)} if isinstance(reply, Exception) else reply
+            for name, reply in zip(names, replies)
+        }
+
+    def close(self):
+        for worker in self.workers.values():
+            worker.close()
+
+
+# Worker process side
+
+
+def _initialize(mt5, account):
+    kwargs = {key: account[key] for key in INITIALIZE_KEYS if account.get(key) is not None}
+    if "login" in kwargs:
+        kwargs["login"] = int(kwargs["login"])
+    if account.get("path"):
+        return mt5.initialize(account["path"], **kwargs)
+    return mt5.initialize(**kwargs)
+
+
+def execute_plan(mt5, plan):
+    """Size one signal's ladder against this terminal's account and send its orders."""
+    from account_cache import SIZING_BASIS_FIELDS
+    from lot_sizing import calculate_lot_sizes
+    from order_retry import RetryPolicy, is_retryable
+    from order_validation import check_volume
+
+    started = time.perf_counter()
+    requests = plan["requests"]
+    spec = mt5.symbol_info(plan["symbol"])
+    if spec is None:
+        return {"error": f"Symbol {plan['symbol']} not available on this terminal: {mt5.last_error()}"}
+    policy = RetryPolicy(**plan.get("retry", {}))
+    deadline = policy.start()
+
+    if plan["mode"] == "fixed":
+        volumes = plan["values"]
+    else:
+        account = mt5.account_info()
+        if account is None:
+            return {"error": f"Failed to get account info: {mt5.last_error()}"}
+        balance = getattr(account, SIZING_BASIS_FIELDS.get(plan["basis"], "balance"))
+        volumes = calculate_lot_sizes(balance, plan["values"], plan["limits"], plan["sl"], spec)
+        volumes = [0.1 if volume is None else volume for volume in volumes]
+
+    results = []
+    for request, volume in zip(requests, volumes):
+        sent = time.perf_counter()
+        retcode, retried = None, []
+        # Requests that failed the bot's price checks arrive as None
+        problem = check_volume(volume, spec) if request is not None else None
+        if request is not None and problem is None:
+            while True:
+                result = mt5.order_send({**request, "volume": float(volume)})
+                retcode = result.retcode if result is not None else None
+                if not is_retryable(retcode):
+                    break
+                # Resend transient failures, same schedule as the bot's own account
+                delay = policy.next_delay(len(retried) + 1, deadline)
+                if delay is None:
+                    break
+                retried.append(retcode)
+                time.sleep(delay)
+        entry = {
+            "success": retcode == mt5.TRADE_RETCODE_DONE,
+            "retcode": retcode,
+            "volume": volume,
+            "retried": retried,
+            "latency": time.perf_counter() - sent,
+        }
+        if problem:
+            entry["error"] = problem[1]
+        results.append(entry)
+    return {"results": results, "seconds": time.perf_counter() - started}
+
+
+def serve():
+    """Worker loop: account settings on the first line, then one plan per line."""
+    from mt5_backend import mt5
+
+    account = json.loads(sys.stdin.readline())
+    error = None
+    if not _initialize(mt5, account):
+        error = f"MT5 initialization failed: {mt5.last_error()}"
+
+    for line in sys.stdin:
+        job = json.loads(line)
+        try:
+            reply = {"error": error} if error else execute_plan(mt5, job["plan"])
+        except Exception as e:
+            reply = {"error": f"{type(e).__name__}: {str(e)}"}
+        sys.stdout.write(json.dumps({"id": job["id"], **reply}) + "\n")
+        sys.stdout.flush()
+
+    mt5.shutdown()
+
+
+if __name__ == "__main__":
+    serve()
@@ -0,0 +1,87 @@
+"""
+Parse-throughput benchmark: single-pass tokenizer vs the original regex chain.
+
+Runs over a corpus of real-style signals plus channel chatter, no MT5 terminal
+needed:
+    python benchmarks/bench_signal_parser.py
+"""
+
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from signal_tokenizer import tokenize_signal  # noqa: E402
+
+SIGNALS = [
+    "Gold long 2345.50 2341.20 2337.80 SL 2325",
+    "XAUUSD SHORT 2412 2418 2424 2430 stops 2445\nComments: wait for NY open",
+    "EURUSD long 1.08520 1.08350 1.08100 sl 1.07800 vth",
+    "gu short 1.2750 1.2780 1.2810 1.2840 stop loss 1.2900 hot",
+    "uj long 154.20 153.80 153.40 SL 152.60 day",
+    "DAX short 18420 18480 18550 18620 sl 18750 week",
+    "nas long 17850 17790 17720 17650 17580 sl 17400\nComments: scaling in, alien",
+    "btc long 61250 60800 60300 sl 59200",
+    "AUDUSD long 65210 65050 64890 sl 64500",
+    "US30 short 39250 39400 39550 39700 39850 40000 40150 40300 sl 40600",
+    "AAPL.NAS long 182.5 180.2 sl 176",
+    "silver short 31.20 31.45 31.70 sl 32.10 vth\nComments: hot call, valid till hit",
+]
+
+CHATTER = [
+    "gm everyone",
+    "anyone else stopped out on gold today?",
+    "nice call on gu yesterday, +80 pips",
+    "what time is NFP?",
+    "lol",
+    "I'm waiting for the weekly close before I do anything",
+]
+
+CORPUS = SIGNALS + CHATTER
+
+
+def legacy_tokens(message):
+    """The original extraction in parse_tm_signal, one re.search per field."""
+    position_match = re.search(r"\b(long|short)\b", message.lower())
+    position = position_match.group(1).upper() if position_match else None
+    numbers = re.findall(r"(\d+\.?\d*)", message)
+
+    comments = ""
+    comments_match = re.search(r"Comments:(.*?)(?=$|\n)", message, re.IGNORECASE)
+    if comments_match:
+        comments = comments_match.group(1).strip()
+
+    keywords = {
+        keyword
+        for keyword in ("hot", "vth", "alien", "day", "week")
+        if re.search(keyword, message.lower())
+    }
+    return position, numbers, comments, keywords
+
+
+def tokenizer_tokens(message):
+    tokens = tokenize_signal(message)
+    return tokens.position, tokens.numbers, tokens.comments, tokens.keywords
+
+
+def main():
+    for message in CORPUS:
+        expected = legacy_tokens(message)
+        actual = tokenizer_tokens(message)
+        assert expected == actual, f"{message!r}: {expected} != {actual}"
+
+    rounds = 5_000
+    legacy = timeit.timeit(lambda: [legacy_tokens(m) for m in CORPUS], number=rounds)
+    tokenized = timeit.timeit(lambda: [tokenizer_tokens(m) for m in CORPUS], number=rounds)
+    messages = rounds * len(CORPUS)
+
+    print(f"Corpus:              {len(SIGNALS)} signals, {len(CHATTER)} chatter messages")
+    print(f"Legacy regex chain:  {messages / legacy:,.0f} msgs/s")
+    print(f"Single-pass scan:    {messages / tokenized:,.0f} msgs/s")
+    print(f"Speed-up:            {legacy / tokenized:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Micro-benchmark: SymbolIndex lookups vs the original get_mapped_symbol scan.
+
+Runs on a synthetic 10k-symbol catalog, no MT5 terminal needed:
+    python benchmarks/bench_symbol_index.py
+"""
+
+import os
+import random
+import string
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from symbol_index import SymbolIndex  # noqa: E402
+
+SYMBOL_MAPPINGS = {
+    "gold": "XAUUSD",
+    "dax": "DE40",
+    "spx": "US500",
+    "nas": "USTEC",
+    "btc": "BTCUSD",
+    "eth": "ETHUSD",
+    "gu": "GBPUSD",
+    "uj": "USDJPY",
+    "silver": "XAGUSD",
+}
+
+CURRENCIES = ["USD", "EUR", "GBP", "JPY", "AUD", "NZD", "CAD", "CHF", "SGD", "HKD"]
+
+
+def build_catalog(size=10_000, seed=7):
+    """Synthetic broker catalog: forex and CFDs with broker suffixes, padded with stocks."""
+    rng = random.Random(seed)
+    catalog = set()
+    bases = [a + b for a in CURRENCIES for b in CURRENCIES if a != b]
+    bases += ["XAUUSD", "XAGUSD", "DE40", "US500", "USTEC", "BTCUSD", "ETHUSD", "US30"]
+    for base in bases:
+        catalog.add(base)
+        catalog.add(base + rng.choice([".r", ".p", "m"]))
+    while len(catalog) < size:
+        ticker = "".join(rng.choices(string.ascii_uppercase, k=rng.randint(2, 5)))
+        catalog.add(ticker + rng.choice([".NYSE", ".NAS"]))
+    return catalog
+
+
+def legacy_get_mapped_symbol(text, available_symbols):
+    """The original lookup (without the company-name fallback, which needs a terminal)."""
+    text = text.lower()
+    words = text.upper().split()
+    for word in words:
+        if word.endswith((".NYSE", ".NAS")):
+            if word in available_symbols:
+                return word
+            else:
+                return None
+
+    for key, mapped_symbol in SYMBOL_MAPPINGS.items():
+        if key in text:
+            for suffix in [".r", ".p", "m"]:
+                variant = f"{mapped_symbol}{suffix}"
+                if variant in available_symbols:
+                    return variant
+            return mapped_symbol if mapped_symbol in available_symbols else None
+
+    for word in words:
+        for suffix in [".r", ".p", "m"]:
+            variant = f"{word}{suffix}"
+            if variant in available_symbols:
+                return variant
+        if word in available_symbols:
+            return word
+    return None
+
+
+def indexed_get_mapped_symbol(text, index):
+    """The same lookup order, answered from the precomputed index."""
+    text = text.lower()
+    words = text.upper().split()
+    for word in words:
+        if word.endswith((".NYSE", ".NAS")):
+            return word if word in index else None
+
+    matched, mapped_symbol = index.resolve_alias(text)
+    if matched:
+        return mapped_symbol
+
+    for word in words:
+        symbol = index.resolve_token(word)
+        if symbol:
+            return symbol
+    return None
+
+
+SIGNALS = [
+    "gold long 2345.5 2340 2335 sl 2320",
+    "EURUSD short 1.0850 1.0870 1.0890 stop 1.0920 vth",
+    "AUDNZD long 1.0950 1.0930 1.0900",
+    "short dax 18250 18300 18420",
+    "CADCHF long 0.6450 0.6430 0.6400 hot",
+    "ABCD.NYSE long 120.5 118.0",
+    "XYZ long 10 9 8",
+]
+
+
+def main():
+    catalog = build_catalog()
+
+    build_seconds = timeit.timeit(lambda: SymbolIndex(catalog, SYMBOL_MAPPINGS), number=5) / 5
+    index = SymbolIndex(catalog, SYMBOL_MAPPINGS)
+
+    for signal in SIGNALS:
+        expected = legacy_get_mapped_symbol(signal, catalog)
+        actual = indexed_get_mapped_symbol(signal, index)
+        assert expected == actual, f"{signal!r}: {expected} != {actual}"
+
+    rounds = 20_000
+    legacy = timeit.timeit(
+        lambda: [legacy_get_mapped_symbol(s, catalog) for s in SIGNALS], number=rounds
+    )
+    indexed = timeit.timeit(
+        lambda: [indexed_get_mapped_symbol(s, index) for s in SIGNALS], number=rounds
+    )
+    lookups = rounds * len(SIGNALS)
+
+    print(f"Catalog size:        {len(catalog)} symbols")
+    print(f"Index build:         {build_seconds * 1000:.2f} ms ({len(index.tradable)} keys)")
+    print(f"Legacy lookup:       {legacy / lookups * 1e6:.2f} us/signal")
+    print(f"Indexed lookup:      {indexed / lookups * 1e6:.2f} us/signal")
+    print(f"Speed-up:            {legacy / indexed:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
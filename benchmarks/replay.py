@@ -0,0 +1,167 @@
+"""
+Replay recorded Discord messages through on_message without connecting to Discord.
+
+Each line of the input is a JSON object with "content" and optionally
+"channel"; without an input file the parser benchmark corpus is replayed.
+Messages are released at --rate per second (0 = as fast as possible) and
+handled by --concurrency concurrent handlers, like several mirrored channels
+posting at once. MT5 is the in-process simulator unless MT5_SIMULATOR says
+otherwise (e.g. a JSON file that injects order_send latency):
+
+    python benchmarks/replay.py signals.jsonl --rate 50 --concurrency 8 --repeat 10
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCH_DIR)
+
+from bench_signal_parser import CORPUS  # noqa: E402
+from run_benchmarks import FakeChannel, FakeMessage, import_main  # noqa: E402
+
+# The loop monitor sleeps this long; anything beyond it is time the loop was blocked
+MONITOR_INTERVAL = 0.005
+
+
+def load_messages(path):
+    if not path:
+        return [{"content": content, "channel": "corpus"} for content in CORPUS]
+    messages = []
+    with open(path, "r") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                record = json.loads(line)
+                messages.append({"content": record["content"], "channel": record.get("channel", "replay")})
+    return messages
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+async def monitor_loop(stop, stalls):
+    """Record how late each short sleep wakes up; the overshoot is event-loop blocking."""
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(MONITOR_INTERVAL)
+        stalls.append(max(0.0, time.perf_counter() - started - MONITOR_INTERVAL))
+
+
+async def replay(bot, messages, rate, concurrency):
+    channels = {}
+    queue = asyncio.Queue(maxsize=concurrency * 2)
+    latencies, lags = [], []
+
+    async def worker():
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            message, scheduled = item
+            started = time.perf_counter()
+            lags.append(started - scheduled)
+            await bot.on_message(message)
+            latencies.append(time.perf_counter() - started)
+
+    stop, stalls = asyncio.Event(), []
+    monitor = asyncio.create_task(monitor_loop(stop, stalls))
+    workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+
+    started = time.perf_counter()
+    for index, record in enumerate(messages):
+        channel = channels.setdefault(record["channel"], FakeChannel())
+        scheduled = started + index / rate if rate else time.perf_counter()
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        await queue.put((FakeMessage(record["content"], channel), scheduled))
+    for _ in workers:
+        await queue.put(None)
+    await asyncio.gather(*workers)
+    await bot.REPLY_QUEUE.flush()
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await monitor
+    replies = sum(len(channel.sent) for channel in channels.values())
+    return elapsed, sorted(latencies), sorted(lags), stalls, replies
+
+
+def run_replay():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("path", nargs="?", help="JSONL file of recorded messages")
+    parser.add_argument("--rate", type=float, default=0.0, help="messages per second, 0 = as fast as possible")
+    parser.add_argument("--concurrency", type=int, default=4, help="messages handled at the same time")
+    parser.add_argument("--repeat", type=int, default=1, help="replay the file this many times")
+    parser.add_argument("--dedup", action="store_true", help="keep duplicate-signal suppression on")
+    parser.add_argument("--output", help="write the report to this JSON file")
+    args = parser.parse_args()
+
+    messages = load_messages(args.path and os.path.abspath(args.path)) * args.repeat
+    output = os.path.abspath(args.output) if args.output else None
+
+    with tempfile.TemporaryDirectory(prefix="bot-replay-") as workdir:
+        bot = import_main(workdir)
+        if args.dedup:
+            bot.SIGNAL_DEDUP.ttl = float(bot.risk_config.get("duplicate_window", 300))
+        done = bot.METRICS.counter("order_retcodes", label="retcode")
+        orders_before = sum(done.values())
+        placed_before = done[bot.mt5.TRADE_RETCODE_DONE]
+        try:
+            elapsed, latencies, lags, stalls, replies = asyncio.run(
+                replay(bot, messages, args.rate, max(1, args.concurrency))
+            )
+        finally:
+            bot.SETTINGS_WRITER.close()
+            bot.QUOTE_CACHE.stop()
+            bot.ACCOUNT_CACHE.stop()
+            bot.MT5_EXECUTOR.shutdown()
+            os.chdir(BENCH_DIR)
+
+    orders = sum(done.values()) - orders_before
+    placed = done[bot.mt5.TRADE_RETCODE_DONE] - placed_before
+    report = {
+        "messages": len(messages),
+        "seconds": elapsed,
+        "messages_per_second": len(messages) / elapsed,
+        "orders_sent": orders,
+        "orders_placed": placed,
+        "orders_per_second": placed / elapsed,
+        "replies": replies,
+        "latency_ms": {f"p{int(q * 100)}": percentile(latencies, q) * 1000 for q in (0.5, 0.95, 0.99)},
+        "queue_lag_ms": {f"p{int(q * 100)}": percentile(lags, q) * 1000 for q in (0.5, 0.95, 0.99)},
+        "loop_blocked_ms": {
+            "total": sum(stalls) * 1000,
+            "max": max(stalls, default=0.0) * 1000,
+            "share": sum(stalls) / elapsed,
+        },
+        "rate": args.rate,
+        "concurrency": args.concurrency,
+    }
+
+    print(
+        f"{report['messages']} messages in {elapsed:.2f} s: {report['messages_per_second']:.0f} msg/s, "
+        f"{report['orders_per_second']:.0f} orders/s ({placed}/{orders} placed), {replies} replies"
+    )
+    print("latency ms:   " + "  ".join(f"{k} {v:.2f}" for k, v in report["latency_ms"].items()))
+    print("queue lag ms: " + "  ".join(f"{k} {v:.2f}" for k, v in report["queue_lag_ms"].items()))
+    blocked = report["loop_blocked_ms"]
+    print(f"event loop blocked: {blocked['total']:.1f} ms total, {blocked['max']:.1f} ms max ({blocked['share']:.1%})")
+
+    if output:
+        with open(output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote report to {output}")
+
+
+if __name__ == "__main__":
+    run_replay()
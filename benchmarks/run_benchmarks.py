@@ -0,0 +1,252 @@
+"""
+Benchmark suite for the signal-to-order hot path, no MT5 terminal needed.
+
+Imports main.py against the in-process MT5 simulator (MT5_SIMULATOR=1),
+inside a scratch directory so config/settings/log files never touch the repo.
+Results are written as JSON and can be compared against an earlier run:
+
+    python benchmarks/run_benchmarks.py --output bench.json
+    python benchmarks/run_benchmarks.py --baseline bench.json --fail-on-regression
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import timeit
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+from bench_signal_parser import CORPUS  # noqa: E402
+
+CATALOG_SIZES = (100, 5000, 50000)
+FOREX_SAMPLES = ["EURUSD.r", "USDJPY", "XAUUSD.r", "AAPL.NAS", "GBPNZD", "DE40.r", "USDSGD.r", "BTCUSD"]
+SYMBOL_TEXTS = [
+    "Gold long 2345.50 2341.20 SL 2325",
+    "gu short 1.2750 1.2780 stop loss 1.2900",
+    "EURUSD long 1.08520 1.08350 sl 1.07800",
+    "AAPL long 182.5 180.2 sl 176",
+    "nas long 17850 17790 sl 17400",
+    "nothing to see here",
+]
+E2E_SIGNALS = [
+    "Gold long 2345.50 2341.20 2337.80 SL 2325",
+    "EURUSD short 1.10520 1.10650 1.10800 1.10950 sl 1.11300",
+    "nas long 17850 17790 17720 17650 17580 sl 17400",
+]
+
+
+class FakeChannel:
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, content):
+        self.sent.append(content)
+
+    def __str__(self):
+        return "bench"
+
+
+class FakeMessage:
+    def __init__(self, content, channel):
+        self.content = content
+        self.channel = channel
+        self.author = object()
+
+
+def import_main(workdir):
+    """Import main.py against the simulated terminal from inside workdir."""
+    os.environ.setdefault("MT5_SIMULATOR", "1")
+    os.chdir(workdir)
+    with open("config.json", "w") as f:
+        json.dump({"discord_token": "benchmark"}, f)
+
+    import main
+    from bot_logging import set_log_level
+
+    set_log_level("warning")
+    # The suites send the same signals over and over, which duplicate suppression would drop
+    main.SIGNAL_DEDUP.ttl = 0
+    # Fake channels have no Discord rate limit to respect
+    main.REPLY_QUEUE.rate, main.REPLY_QUEUE.burst = 1e6, 1000
+    main.mt5.set_catalog(CATALOG_SIZES[0])
+    main.load_symbol_catalog(main.mt5.symbols_get())
+    return main
+
+
+def measure(fn, number, repeat):
+    """Best-of-repeat seconds per call, the usual timeit convention."""
+    best = min(timeit.repeat(fn, number=number, repeat=repeat))
+    return best / number
+
+
+def record(results, name, seconds, **params):
+    results[name] = {"seconds_per_call": seconds, "calls_per_second": 1 / seconds if seconds else None, **params}
+    print(f"{name:<42} {seconds * 1e6:>12.2f} us/call")
+
+
+def bench_is_forex_pair(main, results, number, repeat):
+    def run():
+        for symbol in FOREX_SAMPLES:
+            main.is_forex_pair(symbol)
+
+    record(results, "is_forex_pair", measure(run, number, repeat) / len(FOREX_SAMPLES))
+
+
+def bench_get_mapped_symbol(main, results, number, repeat):
+    for size in CATALOG_SIZES:
+        main.mt5.set_catalog(size)
+        main.load_symbol_catalog(main.mt5.symbols_get())
+
+        def run():
+            for text in SYMBOL_TEXTS:
+                main.get_mapped_symbol(text)
+
+        # Fewer iterations on big catalogs, the first lookup also builds the description index
+        run()
+        seconds = measure(run, max(1, number // 10), repeat) / len(SYMBOL_TEXTS)
+        record(results, f"get_mapped_symbol[{size}]", seconds, catalog_size=size)
+
+    main.mt5.set_catalog(CATALOG_SIZES[0])
+    main.load_symbol_catalog(main.mt5.symbols_get())
+
+
+def bench_parse_tm_signal(main, results, number, repeat):
+    signals = [message for message in CORPUS if main.looks_like_signal(message)]
+
+    def run():
+        for message in signals:
+            try:
+                main.parse_tm_signal(message)
+            except ValueError:
+                pass
+
+    seconds = measure(run, max(1, number // 10), repeat) / len(signals)
+    record(results, "parse_tm_signal", seconds, corpus_size=len(signals))
+
+
+def bench_lot_sizing(main, results, number, repeat):
+    record(
+        results,
+        "calculate_lot_size",
+        measure(lambda: main.calculate_lot_size(10000.0, 1.0, "XAUUSD.r", 2345.5, 2325.0), number, repeat),
+    )
+
+    for mode in ("risk", "fixed"):
+        main.risk_config["mode"] = mode
+        main.refresh_risk_snapshot()
+        for num_limits in range(1, main.MAX_CONFIGURED_LIMITS + 1):
+            limits = [2345.5 - 2.5 * i for i in range(num_limits)]
+            seconds = measure(
+                lambda: main.get_volumes_for_limits("XAUUSD.r", limits, 2300.0, "BUY"), number, repeat
+            )
+            record(results, f"get_volumes_for_limits[{mode},{num_limits}]", seconds, limits=num_limits)
+    main.risk_config["mode"] = "risk"
+    main.refresh_risk_snapshot()
+
+
+def bench_on_message(main, results, number, repeat):
+    channel = FakeChannel()
+    messages = [FakeMessage(content, channel) for content in E2E_SIGNALS]
+    count = max(1, number // 20)
+
+    async def run():
+        for _ in range(count):
+            for message in messages:
+                await main.on_message(message)
+        await main.REPLY_QUEUE.flush()
+
+    timings = []
+    for _ in range(repeat):
+        channel.sent.clear()
+        orders_before = main.mt5.orders_placed
+        started = time.perf_counter()
+        asyncio.run(run())
+        timings.append(time.perf_counter() - started)
+        orders = main.mt5.orders_placed - orders_before
+
+    # Replies that queued up together arrive merged, one per line
+    if not all(line.startswith("Placed") for reply in channel.sent for line in reply.split("\n")):
+        raise RuntimeError(f"End-to-end run did not place orders: {channel.sent[:1]}")
+    signals = count * len(messages)
+    record(results, "on_message", min(timings) / signals, orders_per_signal=orders / signals)
+
+
+def compare(results, baseline, threshold):
+    """Print the change against a baseline run and return the names that regressed."""
+    regressions = []
+    print(f"\n{'benchmark':<42} {'baseline us':>12} {'current us':>12} {'change':>8}")
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        ratio = result["seconds_per_call"] / previous["seconds_per_call"]
+        flag = ""
+        if ratio > 1 + threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(
+            f"{name:<42} {previous['seconds_per_call'] * 1e6:>12.2f} "
+            f"{result['seconds_per_call'] * 1e6:>12.2f} {(ratio - 1) * 100:>+7.1f}%{flag}"
+        )
+    return regressions
+
+
+def run_suite():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--baseline", help="compare against a JSON file from an earlier run")
+    parser.add_argument("--threshold", type=float, default=0.15, help="allowed slowdown before flagging (0.15 = 15%%)")
+    parser.add_argument("--fail-on-regression", action="store_true", help="exit with status 1 on any regression")
+    parser.add_argument("--quick", action="store_true", help="fewer iterations, for a smoke run")
+    args = parser.parse_args()
+
+    output = os.path.abspath(args.output) if args.output else None
+    baseline_file = os.path.abspath(args.baseline) if args.baseline else None
+    number, repeat = (20, 3) if args.quick else (200, 5)
+
+    with tempfile.TemporaryDirectory(prefix="bot-bench-") as workdir:
+        bot = import_main(workdir)
+        results = {}
+        try:
+            bench_is_forex_pair(bot, results, number * 10, repeat)
+            bench_get_mapped_symbol(bot, results, number, repeat)
+            bench_parse_tm_signal(bot, results, number, repeat)
+            bench_lot_sizing(bot, results, number, repeat)
+            bench_on_message(bot, results, number, repeat)
+        finally:
+            bot.SETTINGS_WRITER.close()
+            bot.QUOTE_CACHE.stop()
+            bot.ACCOUNT_CACHE.stop()
+            bot.MT5_EXECUTOR.shutdown()
+            os.chdir(BENCH_DIR)
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "quick": args.quick,
+        "results": results,
+    }
+    if output:
+        with open(output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {len(results)} results to {output}")
+
+    if baseline_file:
+        with open(baseline_file, "r") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}: {', '.join(regressions)}")
+            if args.fail_on_regression:
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    run_suite()
@@ -0,0 +1,99 @@
+"""
+Leveled, structured logging that stays off the trading hot path.
+
+Records are put on an in-memory queue by a QueueHandler and written by a
+background QueueListener to the console and a rotating log file. Every record
+carries the correlation id of the signal being processed, so all lines of one
+signal can be grepped together.
+"""
+
+import contextvars
+import logging
+import logging.handlers
+import queue
+import uuid
+
+LOGGER_NAME = "bot"
+
+# Correlation id of the signal being processed ("-" outside a signal)
+SIGNAL_ID = contextvars.ContextVar("signal_id", default="-")
+
+_listener = None
+
+
+class _SignalIdFilter(logging.Filter):
+    def filter(self, record):
+        record.signal_id = SIGNAL_ID.get()
+        return True
+
+
+class StructuredFormatter(logging.Formatter):
+    """One line per record: time, level, logger, signal id, message, then key=value fields."""
+
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)s %(name)s signal=%(signal_id)s %(message)s")
+
+    def format(self, record):
+        line = super().format(record)
+        fields = getattr(record, "fields", None)
+        if fields:
+            line += " " + " ".join(f"{key}={value!r}" for key, value in fields.items())
+        return line
+
+
+def get_logger(name=None):
+    """Return the bot logger, or a child of it for a module."""
+    return logging.getLogger(f"{LOGGER_NAME}.{name}" if name else LOGGER_NAME)
+
+
+def new_signal_id():
+    """Start a new correlation id for the current signal and return it."""
+    signal_id = uuid.uuid4().hex[:12]
+    SIGNAL_ID.set(signal_id)
+    return signal_id
+
+
+def setup_logging(log_file="bot.log", level="INFO", max_bytes=5_000_000, backup_count=5):
+    """
+    Route the bot logger through a non-blocking queue to the console and a
+    rotating log file. Safe to call again to change the level.
+    """
+    global _listener
+
+    logger = get_logger()
+    set_log_level(level)
+    if _listener is not None:
+        return logger
+
+    formatter = StructuredFormatter()
+    console = logging.StreamHandler()
+    console.setFormatter(formatter)
+    handlers = [console]
+    if log_file:
+        file_handler = logging.handlers.RotatingFileHandler(
+            log_file, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+        )
+        file_handler.setFormatter(formatter)
+        handlers.append(file_handler)
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.addFilter(_SignalIdFilter())
+    logger.addHandler(queue_handler)
+    logger.propagate = False
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    return logger
+
+
+def set_log_level(level):
+    get_logger().setLevel(level.upper() if isinstance(level, str) else level)
+
+
+def shutdown_logging():
+    """Drain the queue and stop the background writer."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
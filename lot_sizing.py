@@ -0,0 +1,81 @@
+"""
+Vectorized lot sizing for limit ladders of any length.
+
+Every stop distance, loss-per-lot, clamp and volume-step rounding of a ladder
+is computed in one NumPy pass. Per element the arithmetic is the same as the
+original per-limit calculate_lot_size, so results are identical.
+"""
+
+import numpy as np
+
+from bot_logging import get_logger
+
+log = get_logger("lot_sizing")
+
+# Rules for generating profiles of ladders longer than the configured ones
+LADDER_RULES = ("equal", "weighted")
+
+
+def calculate_lot_sizes(balance, risk_percentages, entry_prices, sl, symbol_info):
+    """
+    Calculate the lot size of every limit in a ladder.
+
+    Args:
+        balance (float): Account balance (or equity) to risk against
+        risk_percentages (sequence): Risk percentage per limit
+        entry_prices (sequence): Entry price per limit
+        sl (float): Stop loss shared by the ladder
+        symbol_info: Object with point, trade_tick_value and volume_min/max/step
+
+    Returns:
+        list: Lot size per limit, None where the stop is too close to size a position
+    """
+    try:
+        entries = np.asarray(entry_prices, dtype=np.float64)
+        risks = np.asarray(risk_percentages, dtype=np.float64)[: len(entries)]
+        sl = float(sl)
+    except ValueError as e:
+        log.error(f"Error converting entry price or SL to float: {e}")
+        return [None] * len(entry_prices)
+
+    risk_amounts = balance * (risks / 100)
+
+    stop_loss_ticks = np.abs(entries - sl) / symbol_info.point
+    potential_loss_per_lot = stop_loss_ticks * symbol_info.trade_tick_value
+
+    # Zero or negligible loss per lot cannot be sized
+    valid = potential_loss_per_lot >= 0.0001
+    with np.errstate(divide="ignore", invalid="ignore"):
+        lot_sizes = risk_amounts / potential_loss_per_lot
+
+    # Clamp to the broker's volume limits, otherwise round down to the volume step
+    volume_step = symbol_info.volume_step
+    stepped = np.trunc(lot_sizes / volume_step) * volume_step
+    lot_sizes = np.where(
+        lot_sizes < symbol_info.volume_min,
+        symbol_info.volume_min,
+        np.where(lot_sizes > symbol_info.volume_max, symbol_info.volume_max, stepped),
+    )
+
+    return [lot if ok else None for lot, ok in zip(lot_sizes.tolist(), valid.tolist())]
+
+
+def round_volumes(volumes, symbol_info):
+    """Round generated volumes down to the volume step, within the broker's limits."""
+    volumes = np.asarray(volumes, dtype=np.float64)
+    volume_step = symbol_info.volume_step
+    stepped = np.trunc(np.round(volumes / volume_step, 8)) * volume_step
+    return np.clip(stepped, symbol_info.volume_min, symbol_info.volume_max).tolist()
+
+
+def split_ladder(total, num_limits, rule="equal"):
+    """
+    Split a total (lots or risk %) over num_limits by the ladder rule and
+    return an array: "equal" gives every limit the same share, "weighted"
+    gives deeper limits linearly more.
+    """
+    if rule == "weighted":
+        weights = np.arange(1, num_limits + 1, dtype=np.float64)
+    else:
+        weights = np.ones(num_limits, dtype=np.float64)
+    return total * weights / weights.sum()
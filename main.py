@@ -1,13 +1,40 @@
+import asyncio
 import discord
-import MetaTrader5 as mt5
-import re
 import json
 import datetime
+import functools
 import os
+import threading
+import time
+
+from account_cache import SIZING_BASIS_FIELDS, AccountCache
+from account_pool import AccountPool
+from bot_logging import get_logger, new_signal_id, set_log_level, setup_logging, shutdown_logging
+from lot_sizing import LADDER_RULES, calculate_lot_sizes, round_volumes
+from metrics import Metrics, start_metrics_server
+from mt5_backend import mt5
+from mt5_executor import MT5Executor
+from quote_cache import QuoteCache
+from reply_queue import ReplyQueue
+from risk_snapshot import compile_risk_config
+from settings_store import SettingsWriter, write_json_atomic
+from signal_dedup import SignalDeduplicator, signal_fingerprint
+from signal_tokenizer import looks_like_signal, tokenize_signal
+from symbol_index import DescriptionIndex, SymbolIndex
+from symbol_scheduler import SymbolScheduler
+from order_retry import RetryPolicy, describe_retcode, is_retryable
+from order_validation import validate_order_request
+from symbol_specs import SpecStore, read_snapshot, snapshot_descriptions, write_snapshot
 
 # Configuration files
 CONFIG_FILE = "config.json"
 SETTINGS_FILE = "settings.json"
+SYMBOL_CACHE_FILE = "symbol_descriptions.json"
+SYMBOL_SNAPSHOT_FILE = "symbol_catalog.npy"
+LOG_FILE = "bot.log"
+
+# Seconds of quiet after a settings change before settings.json is written
+SETTINGS_DEBOUNCE = 0.5
 
 # Default risk configurations
 DEFAULT_FIXED_LOTS = {
@@ -32,11 +59,57 @@ DEFAULT_RISK_PERCENTAGES = {
     "8": [1.3, 1.3, 1.3, 1.3, 1.2, 1.2, 1.2, 1.2],
 }
 
+# Ladders up to this many limits use the configured profiles, longer ones follow "ladder_rule"
+MAX_CONFIGURED_LIMITS = 8
+
+# Default quote poller settings (seconds, number of symbols, seconds)
+DEFAULT_QUOTE_SETTINGS = {
+    "quote_poll_interval": 0.5,
+    "quote_watch_size": 32,
+    "quote_max_age": 2.0,
+}
+
+# Default account snapshot settings (seconds, seconds, seconds, seconds, "balance" | "equity" | "margin")
+DEFAULT_ACCOUNT_SETTINGS = {
+    "account_refresh_interval": 5.0,
+    "account_max_age": 15.0,
+    "account_fill_poll_interval": 1.0,
+    "account_fill_watch": 300.0,
+    "sizing_basis": "balance",
+}
+
+# Magic number stamped on the bot's orders, and so on the positions they open
+ORDER_MAGIC = 234000
+
+# Default resend settings for transient order_send failures (count, seconds, seconds, seconds per signal)
+DEFAULT_RETRY_SETTINGS = {
+    "retry_max_attempts": 3,
+    "retry_base_delay": 0.05,
+    "retry_max_delay": 0.5,
+    "retry_deadline": 3.0,
+}
+
+# Default Discord reply pacing per channel (messages per second, burst size)
+DEFAULT_REPLY_SETTINGS = {
+    "reply_rate": 1.0,
+    "reply_burst": 5,
+}
+
 # Create default risk configuration
 DEFAULT_CONFIG = {
     "active_config": "default",
     "mode": "risk",  # Can be "fixed" or "risk"
     "autospread": False,
+    "ladder_rule": "equal",  # Can be "equal" or "weighted"
+    "log_level": "info",  # "debug" also logs per-order request dumps
+    "metrics_port": 0,  # Local Prometheus endpoint port, 0 to disable
+    "symbols_refresh_interval": 0,  # Seconds between symbol catalog diffs, 0 to disable
+    "max_concurrent_symbols": 4,  # Symbols whose signals may execute at the same time
+    "duplicate_window": 300,  # Seconds a repost of the same signal is ignored, 0 to disable
+    **DEFAULT_QUOTE_SETTINGS,
+    **DEFAULT_ACCOUNT_SETTINGS,
+    **DEFAULT_RETRY_SETTINGS,
+    **DEFAULT_REPLY_SETTINGS,
     "configs": {
         "default": {
             "fixed_lots": DEFAULT_FIXED_LOTS,
@@ -45,6 +118,17 @@ DEFAULT_CONFIG = {
     },
 }
 
+# Logging goes through a background queue writer; per-field debug dumps are off by default
+setup_logging(LOG_FILE)
+log = get_logger("main")
+
+# Per-stage latency histograms and counters, shown by `stats` and the metrics endpoint
+METRICS = Metrics()
+METRICS.counter("order_retcodes", label="retcode")
+# Resends by the retcode that triggered them, and how retried orders ended
+ORDER_RETRIES = METRICS.counter("order_retries", label="retcode")
+RETRY_OUTCOMES = METRICS.counter("order_retry_outcomes", label="outcome")
+
 # Load credentials
 try:
     with open(CONFIG_FILE, "r") as f:
@@ -52,22 +136,22 @@ try:
     DISCORD_TOKEN = str(config.get("discord_token", ""))
 
     if not DISCORD_TOKEN:
-        print(
-            "Warning: One or more required configuration values are empty in config.json"
+        log.warning(
+            "One or more required configuration values are empty in config.json"
         )
 
 except Exception as e:
-    print(f"Error loading config.json: {str(e)}")
+    log.error(f"Error loading config.json: {str(e)}")
     exit()
 
 if not DISCORD_TOKEN:
-    print("Discord token not found in config.ini. Please enter it to proceed.")
+    log.error("Discord token not found in config.json. Please enter it to proceed.")
     exit()
 
 
 def is_forex_pair(symbol: str) -> bool:
     """Determine if the symbol is a forex pair."""
-    print("DEBUG:", symbol)
+    log.debug("is_forex_pair: %s", symbol)
     currency_codes = {
         "USD",
         "EUR",
@@ -98,59 +182,52 @@ def is_forex_pair(symbol: str) -> bool:
     return False
 
 
-def calculate_take_profit(symbol, entry_price, position, limit_index=0):
-    """
-    Calculate take profit price based on symbol type and configured value.
-    Returns None if no take profit is set for the symbol.
-    """
-    # Get TP pips configuration
-    tp_pips_config = risk_config.get("tp_pips")
-
-    # If tp_pips is not a dictionary, no take profits are set
-    if not isinstance(tp_pips_config, dict):
-        return None
+# Symbols with their own take profit category in tp_pips
+TP_SYMBOL_CATEGORIES = {
+    "BTCUSD": "btc",
+    "ETHUSD": "eth",
+    "US30": "us30",
+    "US500": "us500",
+    "USTEC": "ustec",
+    "DE40": "de40",
+    "FR40": "fr40",
+    "XAUUSD": "gold",
+    "XAGUSD": "silver",
+    "XTIUSD": "oil",
+}
 
-    # Determine the symbol category
-    symbol_category = None
 
+@functools.lru_cache(maxsize=4096)
+def get_tp_category(symbol):
+    """Return the tp_pips key a symbol falls under, or None."""
     # Check for specific symbol matches first
-    specific_symbols = {
-        "BTCUSD": "btc",
-        "ETHUSD": "eth",
-        "US30": "us30",
-        "US500": "us500",
-        "USTEC": "ustec",
-        "DE40": "de40",
-        "FR40": "fr40",
-        "XAUUSD": "gold",
-        "XAGUSD": "silver",
-        "XTIUSD": "oil",
-    }
+    if symbol in TP_SYMBOL_CATEGORIES:
+        return TP_SYMBOL_CATEGORIES[symbol]
+    if symbol.endswith((".NYSE", ".NAS")):  # Stock
+        return symbol  # Use exact symbol for stocks
+    if is_forex_pair(symbol):
+        return "forex"
+    return None
 
-    if symbol in specific_symbols:
-        symbol_category = specific_symbols[symbol]
-    elif symbol.endswith((".NYSE", ".NAS")):  # Stock
-        symbol_category = symbol  # Use exact symbol for stocks
-    elif is_forex_pair(symbol):
-        symbol_category = "forex"
-
-    # If we couldn't determine the category or no TP is set for this category
-    if (
-        not symbol_category
-        or symbol_category not in tp_pips_config
-        or tp_pips_config[symbol_category] == 0
-    ):
+
+@METRICS.timed("calculate_take_profit")
+def calculate_take_profit(symbol, entry_price, position, limit_index=0, snapshot=None):
+    """
+    Calculate take profit price based on symbol type and configured value.
+    Returns None if no take profit is set for the symbol.
+    """
+    # The compiled TP table only holds categories with a take profit set
+    symbol_category = get_tp_category(symbol)
+    configured_value = (snapshot or RISK_SNAPSHOT).tp_values.get(symbol_category)
+    if configured_value is None:
         return None
 
     # Get symbol info to determine pip size
-    symbol_info = mt5.symbol_info(symbol)
+    symbol_info = SPEC_STORE.get(symbol)
     if not symbol_info:
-        print(f"Symbol info not found for {symbol}")
+        log.warning(f"Symbol info not found for {symbol}")
         return None
 
-    # Get the configured value for this symbol category
-    configured_value = float(tp_pips_config[symbol_category])
-
     # Calculate the TP price based on position direction and symbol type
     entry_price = float(entry_price)
 
@@ -248,16 +325,27 @@ def process_add_command(message_content):
 
 
 def save_risk_config():
-    """Save risk configuration to file"""
+    """Recompile the risk snapshot and queue the configuration to be saved; rapid changes are written once"""
+    refresh_risk_snapshot()
     try:
-        with open(SETTINGS_FILE, "w") as f:
-            json.dump(risk_config, f, indent=4)
+        SETTINGS_WRITER.schedule(risk_config)
         return True
     except Exception as e:
-        print(f"Error saving risk configuration: {str(e)}")
+        log.error(f"Error saving risk configuration: {str(e)}")
         return False
 
 
+def refresh_risk_snapshot():
+    """Compile risk_config into a new RiskSnapshot and swap it in for the signal path."""
+    global RISK_SNAPSHOT
+    try:
+        RISK_SNAPSHOT = compile_risk_config(
+            risk_config, DEFAULT_FIXED_LOTS, DEFAULT_RISK_PERCENTAGES, MAX_CONFIGURED_LIMITS
+        )
+    except Exception as e:
+        log.error(f"Error compiling risk configuration, keeping the previous one: {str(e)}")
+
+
 # Default symbols for TP configuration
 DEFAULT_TP_SYMBOLS = {
     "forex": 0,
@@ -273,19 +361,22 @@ DEFAULT_TP_SYMBOLS = {
     "oil": 0,
 }
 
+# Writes settings.json off the event loop, debounced and atomically
+SETTINGS_WRITER = SettingsWriter(SETTINGS_FILE, debounce=SETTINGS_DEBOUNCE)
+
 # Load or initialize risk configuration
 try:
     if os.path.exists(SETTINGS_FILE):
         # Load existing configuration
         with open(SETTINGS_FILE, "r") as f:
             risk_config = json.load(f)
-        print(f"Loaded existing risk configuration from {SETTINGS_FILE}")
+        log.info(f"Loaded existing risk configuration from {SETTINGS_FILE}")
 
         # Ensure default configuration exists
         if "configs" not in risk_config or "default" not in risk_config.get(
             "configs", {}
         ):
-            print("Adding default configuration to existing config file")
+            log.info("Adding default configuration to existing config file")
             if "configs" not in risk_config:
                 risk_config["configs"] = {}
             if "default" not in risk_config["configs"]:
@@ -306,39 +397,97 @@ try:
         if "autospread" not in risk_config:
             risk_config["autospread"] = False
 
-        save_risk_config()
+        if "ladder_rule" not in risk_config:
+            risk_config["ladder_rule"] = "equal"
+
+        if "log_level" not in risk_config:
+            risk_config["log_level"] = "info"
+
+        if "metrics_port" not in risk_config:
+            risk_config["metrics_port"] = 0
+
+        if "symbols_refresh_interval" not in risk_config:
+            risk_config["symbols_refresh_interval"] = 0
+
+        if "max_concurrent_symbols" not in risk_config:
+            risk_config["max_concurrent_symbols"] = 4
+
+        if "duplicate_window" not in risk_config:
+            risk_config["duplicate_window"] = 300
+
+        for setting, value in {
+            **DEFAULT_QUOTE_SETTINGS,
+            **DEFAULT_ACCOUNT_SETTINGS,
+            **DEFAULT_RETRY_SETTINGS,
+            **DEFAULT_REPLY_SETTINGS,
+        }.items():
+            if setting not in risk_config:
+                risk_config[setting] = value
+
+        # Startup runs before the event loop, so write the normalized settings right away.
+        # A failed write (full disk, read-only directory) keeps the loaded settings in use.
+        try:
+            write_json_atomic(SETTINGS_FILE, risk_config)
+        except Exception as e:
+            log.error(f"Failed to write normalized settings to {SETTINGS_FILE}: {str(e)}")
     else:
         # Create new configuration file with defaults
         risk_config = DEFAULT_CONFIG
         risk_config["tp_pips"] = DEFAULT_TP_SYMBOLS.copy()
-        with open(SETTINGS_FILE, "w") as f:
-            json.dump(risk_config, f, indent=4)
-        print(f"Created new risk configuration in {SETTINGS_FILE}")
+        try:
+            write_json_atomic(SETTINGS_FILE, risk_config)
+            log.info(f"Created new risk configuration in {SETTINGS_FILE}")
+        except Exception as e:
+            log.error(f"Failed to create default settings: {str(e)}")
 except Exception as e:
-    print(f"Error with settings.json: {str(e)}")
+    log.error(f"Error with settings.json: {str(e)}")
     risk_config = DEFAULT_CONFIG
     risk_config["tp_pips"] = DEFAULT_TP_SYMBOLS.copy()
     try:
-        with open(SETTINGS_FILE, "w") as f:
-            json.dump(risk_config, f, indent=4)
-    except:
-        print("Failed to create default settings")
+        # Keep the unreadable file for inspection instead of silently overwriting it
+        if os.path.exists(SETTINGS_FILE):
+            os.replace(SETTINGS_FILE, f"{SETTINGS_FILE}.corrupt")
+            log.warning(f"Moved unreadable settings to {SETTINGS_FILE}.corrupt")
+        write_json_atomic(SETTINGS_FILE, risk_config)
+    except Exception as e:
+        log.error(f"Failed to create default settings: {str(e)}")
 
 
-# Initialize MetaTrader 5
-if not mt5.initialize():
-    print("MT5 initialization failed")
-    exit()
+set_log_level(risk_config.get("log_level", "info"))
+
+# Read-only view of risk_config for signal handling, replaced whenever a command changes it
+RISK_SNAPSHOT = compile_risk_config(
+    risk_config, DEFAULT_FIXED_LOTS, DEFAULT_RISK_PERCENTAGES, MAX_CONFIGURED_LIMITS
+)
+
+# Optional Prometheus text endpoint on localhost
+if risk_config.get("metrics_port"):
+    try:
+        start_metrics_server(METRICS, int(risk_config["metrics_port"]))
+    except Exception as e:
+        log.error(f"Failed to start metrics endpoint: {str(e)}")
+
+# All MT5 calls run on one worker thread that owns the terminal session
+MT5_EXECUTOR = MT5Executor()
+
+def start_mt5():
+    """Initialize MetaTrader 5; runs first on the MT5 worker so every other call queues behind it."""
+    started = time.perf_counter()
+    if not mt5.initialize():
+        log.error(f"MT5 initialization failed: {mt5.last_error()}")
+        return False
+    log.info(f"MT5 initialized in {time.perf_counter() - started:.2f} s")
+    return True
+
+
+# Initialize MetaTrader 5 in the background while the settings load and Discord logs in
+MT5_STARTUP = MT5_EXECUTOR.submit(start_mt5)
 
 # Create the Discord client
 intents = discord.Intents.default()
 intents.message_content = True  # Ensure message content is enabled
 client = discord.Client(intents=intents)
 
-# Get symbols
-symbols = mt5.symbols_get()
-AVAILABLE_SYMBOLS = {symbol.name for symbol in symbols} if symbols else set()
-
 # Different from above
 SYMBOL_MAPPINGS = {
     "gold": "XAUUSD",
@@ -352,6 +501,219 @@ SYMBOL_MAPPINGS = {
     "silver": "XAGUSD",
 }
 
+# Static contract specs for every symbol, refreshed on demand with `specs refresh`
+SPEC_STORE = SpecStore()
+
+# Live quotes for the mapped symbols plus recently signalled ones
+QUOTE_CACHE = QuoteCache(
+    lambda symbol: MT5_EXECUTOR.call(mt5.symbol_info_tick, symbol),
+    poll_interval=float(risk_config.get("quote_poll_interval", 0.5)),
+    watch_size=int(risk_config.get("quote_watch_size", 32)),
+    max_age=float(risk_config.get("quote_max_age", 2.0)),
+)
+
+def get_own_positions():
+    """Tickets of the open positions opened by the bot's orders, or None if MT5 did not answer."""
+    positions = mt5.positions_get()
+    if positions is None:
+        return None
+    return frozenset(position.ticket for position in positions if position.magic == ORDER_MAGIC)
+
+
+# Account snapshot used for risk sizing, refreshed in the background and when our orders fill or close
+ACCOUNT_CACHE = AccountCache(
+    lambda: MT5_EXECUTOR.call(mt5.account_info),
+    refresh_interval=float(risk_config.get("account_refresh_interval", 5.0)),
+    max_age=float(risk_config.get("account_max_age", 15.0)),
+    fetch_positions=lambda: MT5_EXECUTOR.call(get_own_positions),
+    fill_poll_interval=float(risk_config.get("account_fill_poll_interval", 1.0)),
+    fill_watch=float(risk_config.get("account_fill_watch", 300.0)),
+)
+
+# Resend schedule for orders that failed with a transient retcode
+RETRY_POLICY = RetryPolicy.from_settings(risk_config)
+
+
+def index_symbol_catalog(describe):
+    """
+    Rebuild everything derived from the symbols in SPEC_STORE: the available
+    symbol set, the resolver index, the company name index and the pinned quotes.
+    """
+    global AVAILABLE_SYMBOLS, SYMBOL_INDEX, DESCRIPTION_INDEX
+
+    AVAILABLE_SYMBOLS = set(SPEC_STORE.names)
+    log.info(
+        f"Loaded specs for {len(SPEC_STORE)} symbols ({SPEC_STORE.memory_usage() / 1024:.1f} KiB)"
+    )
+
+    # Resolver index over the catalog, built once when symbols are loaded
+    SYMBOL_INDEX = SymbolIndex(AVAILABLE_SYMBOLS, SYMBOL_MAPPINGS)
+
+    # Company name index over stock descriptions, built on first use from the loaded catalog
+    DESCRIPTION_INDEX = DescriptionIndex(
+        [symbol for symbol in AVAILABLE_SYMBOLS if symbol.endswith((".NYSE", ".NAS"))],
+        describe,
+        SYMBOL_CACHE_FILE,
+    )
+
+    QUOTE_CACHE.pin(symbol for _, symbol in SYMBOL_INDEX.aliases)
+
+
+def load_symbol_catalog(catalog):
+    """
+    Load a live catalog from mt5.symbols_get(). Call it on the MT5 worker, which
+    serializes catalog changes with signal parsing; the caller saves the snapshot.
+    """
+    SPEC_STORE.refresh(catalog)
+    index_symbol_catalog(lambda: {symbol.name: symbol.description for symbol in catalog or ()})
+
+
+def load_live_catalog():
+    """
+    Fetch the live catalog and load it; runs on the MT5 worker. Returns the
+    catalog, or None (keeping the loaded one) if the terminal did not answer.
+    """
+    catalog = mt5.symbols_get()
+    if catalog is None:
+        # A disconnected terminal returns None; keep serving the symbols we have
+        log.error(f"Failed to get symbols from MT5: {mt5.last_error()}")
+        return None
+    load_symbol_catalog(catalog)
+    return catalog
+
+
+def save_catalog_snapshot(catalog):
+    try:
+        write_snapshot(SYMBOL_SNAPSHOT_FILE, catalog)
+    except Exception as e:
+        log.warning(f"Error writing symbol catalog snapshot: {str(e)}")
+
+
+def load_catalog_snapshot():
+    """Serve symbols from the memory-mapped snapshot of the last live catalog, if any."""
+    try:
+        records = read_snapshot(SYMBOL_SNAPSHOT_FILE)
+    except Exception as e:
+        log.warning(f"Ignoring symbol catalog snapshot: {str(e)}")
+        return False
+    if records is None or not len(records):
+        return False
+
+    SPEC_STORE.load_snapshot(records)
+    index_symbol_catalog(lambda: snapshot_descriptions(records))
+    return True
+
+
+def refresh_symbol_catalog():
+    """Fetch the live catalog once MT5 is up and rebuild the symbol structures from it."""
+    if not MT5_STARTUP.result():
+        return
+    started = time.perf_counter()
+    catalog = MT5_EXECUTOR.call(load_live_catalog)
+    if catalog is None:
+        return
+    log.info(f"Live symbol catalog loaded in {time.perf_counter() - started:.2f} s")
+    # The file write stays on this thread, off the MT5 worker
+    save_catalog_snapshot(catalog)
+
+
+def update_symbol_catalog(catalog):
+    """
+    Apply the difference between a live catalog and the loaded one to the
+    available symbol set and every structure derived from it, and re-read the
+    trading rules (stops/freeze level, trade mode) of symbols already loaded.
+    Returns (added, removed, changed) symbol names.
+    """
+    live = {symbol.name: symbol for symbol in catalog}
+    added = sorted(live.keys() - AVAILABLE_SYMBOLS)
+    removed = sorted(AVAILABLE_SYMBOLS - live.keys())
+    changed = sorted(SPEC_STORE.update_fields(catalog))
+    if not added and not removed:
+        return added, removed, changed
+
+    SPEC_STORE.update([live[name] for name in added], set(removed))
+    AVAILABLE_SYMBOLS.difference_update(removed)
+    AVAILABLE_SYMBOLS.update(added)
+    SYMBOL_INDEX.update(added, removed)
+
+    DESCRIPTION_INDEX.update(
+        [name for name in added if name.endswith((".NYSE", ".NAS"))],
+        [name for name in removed if name.endswith((".NYSE", ".NAS"))],
+        lambda: {name: symbol.description for name, symbol in live.items()},
+    )
+    QUOTE_CACHE.pin(symbol for _, symbol in SYMBOL_INDEX.aliases)
+    return added, removed, changed
+
+
+def refresh_symbols():
+    """
+    Diff the live catalog against the loaded one; runs on the MT5 worker, which
+    also serializes it with signal parsing.
+    Returns (added, removed, changed, seconds).
+    """
+    started = time.perf_counter()
+    catalog = mt5.symbols_get()
+    if catalog is None:
+        raise RuntimeError(f"Failed to get symbols from MT5: {mt5.last_error()}")
+
+    added, removed, changed = update_symbol_catalog(catalog)
+    seconds = time.perf_counter() - started
+    METRICS.observe("symbols_refresh", seconds)
+    if added or removed or changed:
+        log.info(
+            "Symbol catalog updated",
+            extra={
+                "fields": {
+                    "added": len(added),
+                    "removed": len(removed),
+                    "changed": len(changed),
+                    "ms": round(seconds * 1000, 1),
+                }
+            },
+        )
+        # Keep the snapshot write off the MT5 worker
+        threading.Thread(target=save_catalog_snapshot, args=(catalog,), name="catalog-snapshot").start()
+    return added, removed, changed, seconds
+
+
+def run_symbol_refresher(interval):
+    """Periodic catalog diff, enabled by symbols_refresh_interval."""
+    while not SYMBOL_REFRESH_STOP.wait(interval):
+        try:
+            MT5_EXECUTOR.call(refresh_symbols)
+        except Exception as e:
+            log.warning(f"Error refreshing symbol catalog: {str(e)}")
+
+
+SYMBOL_REFRESH_STOP = threading.Event()
+
+# Get symbols: serve from the last snapshot right away and load the live catalog behind it
+if load_catalog_snapshot():
+    log.info(f"Serving {len(SPEC_STORE)} symbols from {SYMBOL_SNAPSHOT_FILE} until the live catalog loads")
+    threading.Thread(target=refresh_symbol_catalog, name="catalog-refresh", daemon=True).start()
+else:
+    # First start: there is nothing to serve from until MT5 is up
+    if not MT5_STARTUP.result():
+        exit()
+    refresh_symbol_catalog()
+
+# Both pollers go through the MT5 worker, so their first calls queue behind initialization
+QUOTE_CACHE.start()
+ACCOUNT_CACHE.start()
+
+# Additional terminals from config.json; when set, signals are sent to these accounts only
+ACCOUNT_POOL = AccountPool(config["accounts"]) if config.get("accounts") else None
+if ACCOUNT_POOL:
+    ACCOUNT_POOL.start()
+
+if float(risk_config.get("symbols_refresh_interval", 0)) > 0:
+    threading.Thread(
+        target=run_symbol_refresher,
+        args=(float(risk_config["symbols_refresh_interval"]),),
+        name="symbol-refresher",
+        daemon=True,
+    ).start()
+
 
 def calculate_lot_size(balance, risk_percentage, symbol, entry_price, sl):
     """
@@ -363,65 +725,25 @@ def calculate_lot_size(balance, risk_percentage, symbol, entry_price, sl):
         entry_price = float(entry_price)
         sl = float(sl)
     except ValueError as e:
-        print(f"Error converting entry price or SL to float: {e}")
+        log.error(f"Error converting entry price or SL to float: {e}")
         return None
 
-    # Calculate the risk amount based on the balance and risk percentage
-    risk_amount = balance * (risk_percentage / 100)
-    print(f"Risk Amount: {risk_amount}")
-
     # Retrieve symbol information
-    symbol_info = mt5.symbol_info(symbol)
+    symbol_info = SPEC_STORE.get(symbol)
     if not symbol_info:
-        print(f"Symbol info not found for {symbol}")
+        log.warning(f"Symbol info not found for {symbol}")
         return None
 
-    # Contract size and tick size for the symbol
-    contract_size = symbol_info.trade_contract_size
-    tick_size = symbol_info.point
-    tick_value = symbol_info.trade_tick_value  # Tick value per minimum price movement
-
-    # Debug print for symbol info
-    print(f"Symbol Info for {symbol}:")
-    print(f"  Contract Size: {contract_size}")
-    print(f"  Tick Size (Point): {tick_size}")
-    print(f"  Tick Value: {tick_value}")
-    print(f"  Min Volume: {symbol_info.volume_min}")
-    print(f"  Max Volume: {symbol_info.volume_max}")
-    print(f"  Volume Step: {symbol_info.volume_step}")
-
-    # Calculate the stop loss in ticks
-    stop_loss_ticks = abs(entry_price - sl) / tick_size
-    print(f"Stop Loss in Ticks: {stop_loss_ticks}")
-
-    # Calculate potential loss per lot based on stop loss and tick value
-    potential_loss_per_lot = stop_loss_ticks * tick_value
-    print(f"Potential Loss per Lot: {potential_loss_per_lot}")
-
-    # Handle potential zero or extremely small values
-    if potential_loss_per_lot == 0 or potential_loss_per_lot < 0.0001:
-        print("Potential loss per lot is zero or negligible, check SL and entry price.")
+    lot_size = calculate_lot_sizes(balance, [risk_percentage], [entry_price], sl, symbol_info)[0]
+    if lot_size is None:
+        log.warning("Potential loss per lot is zero or negligible, check SL and entry price.")
         return None
 
-    # Calculate the initial lot size based on risk amount and potential loss per lot
-    lot_size = risk_amount / potential_loss_per_lot
-    print(f"Calculated Lot Size before Rounding: {lot_size}")
-
-    # Ensure lot size respects the broker's volume restrictions and rounds to nearest step
-    if lot_size < symbol_info.volume_min:
-        lot_size = symbol_info.volume_min
-        print("Adjusted Lot Size to Min Volume")
-    elif lot_size > symbol_info.volume_max:
-        lot_size = symbol_info.volume_max
-        print("Adjusted Lot Size to Max Volume")
-    else:
-        # Round down to nearest valid increment
-        lot_size = int(lot_size / symbol_info.volume_step) * symbol_info.volume_step
-
-    print(f"Final Calculated Lot Size for {symbol}: {lot_size}")
+    log.debug("Final calculated lot size for %s: %s", symbol, lot_size)
     return lot_size
 
 
+@METRICS.timed("get_mapped_symbol")
 def get_mapped_symbol(text: str) -> str or None:
     """
     Get the correct symbol from text using mappings and available symbols.
@@ -434,7 +756,6 @@ def get_mapped_symbol(text: str) -> str or None:
         str: Found symbol or None
     """
     text = text.lower()
-    # print("DEBUG: ", text)
     # First check for exact stock symbols (ending in .NYSE or .NAS)
     words = text.upper().split()
     for word in words:
@@ -445,28 +766,15 @@ def get_mapped_symbol(text: str) -> str or None:
                 return None
 
     # Then check symbol mappings
-    for key, mapped_symbol in SYMBOL_MAPPINGS.items():
-        if key in text:
-            # Handle other variants for brokers
-            for suffix in ['.r', '.p', 'm']:
-                variant = f"{mapped_symbol}{suffix}"
-                if variant in AVAILABLE_SYMBOLS:
-                    return variant
-
-            # Check if there's
-            return mapped_symbol if mapped_symbol in AVAILABLE_SYMBOLS else None
-
-    # If no mapping found, look for direct symbol match
-    for word in words:
-        # First check suffixed versions
-        for suffix in ['.r', '.p', 'm']:
-            variant = f"{word}{suffix}"
-            if variant in AVAILABLE_SYMBOLS:
-                return variant
+    matched, mapped_symbol = SYMBOL_INDEX.resolve_alias(text)
+    if matched:
+        return mapped_symbol
 
-        # Then check the original word
-        if word in AVAILABLE_SYMBOLS:
-            return word
+    # If no mapping found, look for direct symbol match (suffixed variants preferred)
+    for word in words:
+        symbol = SYMBOL_INDEX.resolve_token(word)
+        if symbol:
+            return symbol
 
     # Check company name only using the first valid word
     skip_words = {"long", "short", "vth", "hot", "stops", "comments", "call", "loss"}
@@ -478,22 +786,9 @@ def get_mapped_symbol(text: str) -> str or None:
     if not words:
         return None
     word = words[0]
-    # print("DEBUG: First word: ", word)
-    matches = []
 
     # Check company names and descriptions for symbol
-    for symbol in AVAILABLE_SYMBOLS:
-        if symbol.endswith((".NYSE", ".NAS")):
-            if word in symbol.lower():
-                # print(f"DEBUG: Found {word} in symbol {symbol}")
-                matches.append(symbol)
-                break
-            else:
-                symbol_info = mt5.symbol_info(symbol)
-                if symbol_info and symbol_info.description:
-                    if word in symbol_info.description.lower():
-                        # print(f"DEBUG: Found {word} in description {symbol_info.description}")
-                        matches.append(symbol)
+    matches = DESCRIPTION_INDEX.lookup(word)
 
     if len(matches) == 1:
         return matches[0]
@@ -521,19 +816,18 @@ def get_friday_end_timestamp():
     return int(friday.timestamp())
 
 
+@METRICS.timed("parse_tm_signal")
 def parse_tm_signal(message):
-    symbol = get_mapped_symbol(message)
-    if not symbol:
-        raise ValueError(f"Error: No valid trading symbol found in string")
+    # Tokenize once; position and numbers are checked before the more expensive symbol lookup
+    tokens = tokenize_signal(message)
 
     # Find position (long/short)
-    position_match = re.search(r"\b(long|short)\b", message.lower())
-    if not position_match:
+    if not tokens.position:
         raise ValueError("Error: Position (long/short) not found in string")
-    position = position_match.group(1).upper()
+    position = tokens.position
 
     # Get all numbers
-    numbers = re.findall(r"(\d+\.?\d*)", message)
+    numbers = tokens.numbers
     if not numbers:
         raise ValueError("Error: No numbers found in string")
     if len(numbers) < 2:
@@ -541,6 +835,10 @@ def parse_tm_signal(message):
             "Error: Not enough numbers found in string. There must be at least 1 limit price and 1 stop loss."
         )
 
+    symbol = get_mapped_symbol(message)
+    if not symbol:
+        raise ValueError(f"Error: No valid trading symbol found in string")
+
     # Convert large numbers if needed (Ex: AUDUSD is sometimes written as 61234 instead of 0.61234)
     if float(numbers[1]) > 30000 and symbol not in ["US30", "JP225", "BTCUSD", "USTEC"]:
         numbers = [str(float(num) / 100000) for num in numbers]
@@ -550,11 +848,8 @@ def parse_tm_signal(message):
     limits = numbers[:-1]
 
     # Get comments and auto-keywords
-    comments = ""
-    comments_match = re.search(r"Comments:(.*?)(?=$|\n)", message, re.IGNORECASE)
-    if comments_match:
-        comments = comments_match.group(1).strip()
-    if re.search("hot", message.lower()):
+    comments = tokens.comments
+    if "hot" in tokens.keywords:
         comments = f"{comments} {', '.join("HOT")}"
 
     # Process expiry (Default to week if not major pair or vth (valid till hit))
@@ -570,18 +865,197 @@ def parse_tm_signal(message):
     ]
     if symbol in major_forex_pairs:
         expiry = "DAY"
-    if re.search("vth", message.lower()):
+    if "vth" in tokens.keywords:
         expiry = "WEEK"
-    if re.search("alien", message.lower()):
+    if "alien" in tokens.keywords:
         expiry = "ALIEN"
-    if re.search("day", message.lower()):
+    if "day" in tokens.keywords:
         expiry = "DAY"
-    if re.search("week", message.lower()):
+    if "week" in tokens.keywords:
         expiry = "WEEK"
 
     return [symbol, position, limits, stop_loss, expiry, comments]
 
 
+def get_order_expiration(expiration):
+    """Return the MT5 (type_time, expiration) pair for a DAY/WEEK/GTC expiry."""
+    if expiration == "DAY":
+        return mt5.ORDER_TIME_DAY, 0  # Expiration not used for DAY
+    elif expiration == "WEEK":
+        today = datetime.datetime.now()
+        if today.weekday() == 4:  # Friday is weekday 4
+            # If today is Friday, change to DAY expiration
+            log.debug("Today is Friday, changing WEEK expiration to DAY")
+            return mt5.ORDER_TIME_DAY, 0
+        # Otherwise, set to next Friday as before
+        expiry = get_friday_end_timestamp()
+        log.debug("Setting expiry to Friday timestamp: %s", expiry)
+        return mt5.ORDER_TIME_SPECIFIED, expiry
+    return mt5.ORDER_TIME_GTC, 0  # Expiration not used for GTC
+
+
+@METRICS.timed("order_build")
+def build_order_request(
+    order_type,
+    order_kind,
+    volume,
+    symbol,
+    entry_price,
+    sl,
+    tp=None,
+    comment=None,
+    expiration=None,
+    symbol_info=None,
+    tick=None,
+    order_expiration=None,
+    snapshot=None,
+):
+    """
+    Build the MT5 order request for one order.
+    Per-signal data (symbol info, quote, expiration, risk snapshot) can be passed
+    in so a ladder looks it up once. Returns None if the symbol or its quote is
+    unavailable.
+    """
+    # Ensure price and sl are floats
+    entry_price = float(entry_price)
+    sl = float(sl)
+    if tp is not None:
+        tp = float(tp)
+
+    # Set order type based on long/short
+    order_type_mt5 = (
+        mt5.ORDER_TYPE_BUY_LIMIT
+        if order_type.upper() == "LONG"
+        else mt5.ORDER_TYPE_SELL_LIMIT
+    )
+
+    # Set order action based on market/limit
+    order_action_mt5 = (
+        mt5.TRADE_ACTION_PENDING
+        if order_kind != "MARKET"
+        else mt5.TRADE_ACTION_DEAL
+    )
+
+    # Get static symbol info for price validation
+    if symbol_info is None:
+        symbol_info = SPEC_STORE.get(symbol)
+    if not symbol_info:
+        log.warning(f"Symbol info not found for {symbol}")
+        return None
+
+    # Apply autospread adjustment if enabled
+    original_entry_price = entry_price
+    if (snapshot or RISK_SNAPSHOT).autospread:
+        # Get the current quote for the spread calculation
+        if tick is None:
+            tick = QUOTE_CACHE.get(symbol)
+        if not tick:
+            log.warning(f"Tick data not found for {symbol}")
+            return None
+
+        # Calculate the spread in price points
+        spread_points = tick.ask - tick.bid
+        log.debug("Current spread for %s: %s", symbol, spread_points)
+
+        # Adjust entry price based on order type
+        if order_type.upper() == "LONG":
+            # For long orders, add the spread to make the limit more likely to be hit
+            entry_price += spread_points
+            log.info(
+                f"Autospread adjusted LONG limit: {original_entry_price} -> {entry_price}"
+            )
+        else:  # SHORT
+            # For short orders, subtract the spread to make the limit more likely to be hit
+            entry_price -= spread_points
+            log.info(
+                f"Autospread adjusted SHORT limit: {original_entry_price} -> {entry_price}"
+            )
+
+    # Set expiration
+    if order_expiration is None:
+        order_expiration = get_order_expiration(expiration)
+    expiry_type, expiry = order_expiration
+
+    # Round prices to the correct number of digits
+    digits = symbol_info.digits
+    entry_price = round(entry_price, digits)
+    sl = round(sl, digits)
+    if tp is not None:
+        tp = round(tp, digits)
+
+    # Prepare order request
+    request = {
+        "action": order_action_mt5,
+        "symbol": symbol,
+        "volume": float(volume),  # Ensure volume is float
+        "type": order_type_mt5,
+        "price": entry_price,
+        "sl": sl,
+        "deviation": 20,
+        "magic": ORDER_MAGIC,
+        "type_filling": mt5.ORDER_FILLING_IOC,
+        "type_time": expiry_type,
+        "expiration": expiry,
+        "comment": comment,
+    }
+
+    # Only add TP if it's not None (MetaTrader doesn't accept None for TP)
+    if tp is not None:
+        request["tp"] = tp
+
+    # Log the request for debugging
+    log.debug("Order request: %s", request)
+    if tick:
+        log.debug("Symbol quote - Ask: %s, Bid: %s", tick.ask, tick.bid)
+    log.debug(
+        "Symbol tick size: %s, digits: %s", symbol_info.trade_tick_size, symbol_info.digits
+    )
+
+    return request
+
+
+def send_order_request(request):
+    """
+    Send a prepared order request to MT5.
+    Returns (success, retcode); retcode is None if the terminal returned no result.
+    """
+    with METRICS.timer("order_send"):
+        result = mt5.order_send(request)
+    METRICS.increment("order_retcodes", result.retcode if result is not None else "none")
+
+    if result is None:
+        error_code = mt5.last_error()
+        log.error(
+            "Order failed with no result",
+            extra={"fields": {"symbol": request["symbol"], "error": error_code}},
+        )
+        return False, None
+
+    # Check the return code to determine if the order was successful
+    # The TRADE_RETCODE_DONE is typically 10009
+    fields = {
+        "symbol": request["symbol"],
+        "type": request["type"],
+        "volume": request["volume"],
+        "price": request["price"],
+        "sl": request["sl"],
+        "tp": request.get("tp"),
+        "retcode": result.retcode,
+        "comment": result.comment,
+    }
+
+    if result.retcode == mt5.TRADE_RETCODE_DONE:
+        log.info("Order placed", extra={"fields": {**fields, "order": result.order}})
+        return True, result.retcode
+
+    fields["reason"] = describe_retcode(result.retcode)
+    if is_retryable(result.retcode):
+        log.info("Order not accepted, can be resent", extra={"fields": fields})
+    else:
+        log.warning("Order failed", extra={"fields": fields})
+    return False, result.retcode
+
+
 def place_trade(
     order_type,
     order_kind,
@@ -597,210 +1071,350 @@ def place_trade(
     Places a trade on MT5 with the given parameters using either risk percentage or fixed lot size.
     """
     try:
-        # Ensure price and sl are floats
-        entry_price = float(entry_price)
-        sl = float(sl)
-        if tp is not None:
-            tp = float(tp)
-
-        # Set order type based on long/short
-        order_type_mt5 = (
-            mt5.ORDER_TYPE_BUY_LIMIT
-            if order_type.upper() == "LONG"
-            else mt5.ORDER_TYPE_SELL_LIMIT
+        request = build_order_request(
+            order_type,
+            order_kind,
+            volume,
+            symbol,
+            entry_price,
+            sl,
+            tp=tp,
+            comment=comment,
+            expiration=expiration,
         )
-
-        # Set order action based on market/limit
-        order_action_mt5 = (
-            mt5.TRADE_ACTION_PENDING
-            if order_kind != "MARKET"
-            else mt5.TRADE_ACTION_DEAL
-        )
-
-        # Get current symbol info for price validation and spread calculation
-        symbol_info = mt5.symbol_info(symbol)
-        if not symbol_info:
-            print(f"Symbol info not found for {symbol}")
+        if request is None:
             return False
 
-        # Apply autospread adjustment if enabled
-        original_entry_price = entry_price
-        if risk_config.get("autospread", False) and symbol_info:
-            # Calculate the spread in price points
-            spread_points = symbol_info.ask - symbol_info.bid
-            print(f"Current spread for {symbol}: {spread_points}")
-
-            # Adjust entry price based on order type
-            if order_type.upper() == "LONG":
-                # For long orders, add the spread to make the limit more likely to be hit
-                entry_price += spread_points
-                print(
-                    f"Autospread adjusted LONG limit: {original_entry_price} -> {entry_price}"
-                )
-            else:  # SHORT
-                # For short orders, subtract the spread to make the limit more likely to be hit
-                entry_price -= spread_points
-                print(
-                    f"Autospread adjusted SHORT limit: {original_entry_price} -> {entry_price}"
-                )
+        success, _ = send_order_request(request)
+        return success
 
-        # Set expiration
-        if expiration == "DAY":
-            expiry_type = mt5.ORDER_TIME_DAY
-            expiry = 0  # Not used for DAY
-        elif expiration == "WEEK":
-            today = datetime.datetime.now()
-            if today.weekday() == 4:  # Friday is weekday 4
-                # If today is Friday, change to DAY expiration
-                expiry_type = mt5.ORDER_TIME_DAY
-                expiry = 0
-                print("Today is Friday, changing WEEK expiration to DAY")
-            else:
-                # Otherwise, set to next Friday as before
-                expiry_type = mt5.ORDER_TIME_SPECIFIED
-                expiry = get_friday_end_timestamp()
-                print(
-                    f"Setting expiry to Friday timestamp: {expiry} ({datetime.datetime.fromtimestamp(expiry)})"
-                )
-        else:
-            expiry_type = mt5.ORDER_TIME_GTC
-            expiry = 0  # Not used for GTC
+    except Exception as e:
+        log.exception(f"Unexpected error in place_trade: {str(e)}")
+        return False
 
-        # Get current symbol info for price validation
-        symbol_info = mt5.symbol_info(symbol)
-        if not symbol_info:
-            print(f"Symbol info not found for {symbol}")
-            return False
 
-        # Round prices to the correct number of digits
-        digits = symbol_info.digits
-        entry_price = round(entry_price, digits)
-        sl = round(sl, digits)
-        if tp is not None:
-            tp = round(tp, digits)
+# Orders failed by the local pre-send checks, by check
+LOCAL_REJECTIONS = METRICS.counter("local_rejections", label="check")
 
-        # Prepare order request
-        request = {
-            "action": order_action_mt5,
-            "symbol": symbol,
-            "volume": float(volume),  # Ensure volume is float
-            "type": order_type_mt5,
-            "price": entry_price,
-            "sl": sl,
-            "deviation": 20,
-            "magic": 234000,
-            "type_filling": mt5.ORDER_FILLING_IOC,
-            "type_time": expiry_type,
-            "expiration": expiry,
-            "comment": comment,
-        }
 
-        # Only add TP if it's not None (MetaTrader doesn't accept None for TP)
-        if tp is not None:
-            request["tp"] = tp
+def build_ladder_requests(
+    order_type,
+    order_kind,
+    symbol,
+    limits,
+    volumes,
+    sl,
+    tps=None,
+    comment=None,
+    expiration=None,
+    check_volumes=True,
+    snapshot=None,
+):
+    """
+    Build the order request of every limit of a signal and check each one
+    against the cached symbol spec and quote. Returns (requests, rejections):
+    a request is None where it cannot be built or failed a local check, and
+    rejections holds the reason in that case. Symbol info, quote and
+    expiration are looked up once for the whole ladder. Volumes are not
+    checked when check_volumes is false (the fan-out fills them in later).
+    """
+    symbol_info = SPEC_STORE.get(symbol)
+    tick = QUOTE_CACHE.get(symbol)
+    order_expiration = get_order_expiration(expiration)
+
+    requests = [
+        build_order_request(
+            order_type,
+            order_kind,
+            volumes[i],
+            symbol,
+            limit,
+            sl,
+            tp=tps[i] if tps else None,
+            comment=comment,
+            expiration=expiration,
+            symbol_info=symbol_info,
+            tick=tick,
+            order_expiration=order_expiration,
+            snapshot=snapshot,
+        )
+        for i, limit in enumerate(limits[: len(volumes)])
+    ]
 
-        # Log the request for debugging
-        print("\nOrder Request:")
-        for key, value in request.items():
-            print(f"  {key}: {value}")
+    rejections = [None] * len(requests)
+    for i, request in enumerate(requests):
+        if request is None:
+            continue
+        problem = validate_order_request(request, symbol_info, tick, check_volumes)
+        if problem is None:
+            continue
+        code, reason = problem
+        METRICS.increment("local_rejections", code)
+        log.warning(
+            "Order rejected locally",
+            extra={"fields": {"symbol": symbol, "limit": limits[i], "check": code, "reason": reason}},
+        )
+        requests[i], rejections[i] = None, reason
+    return requests, rejections
 
-        # Check if price is within allowed range
-        if symbol_info:
-            print(f"Symbol Info - Ask: {symbol_info.ask}, Bid: {symbol_info.bid}")
-            print(f"Symbol tick size: {symbol_info.trade_tick_size}")
-            print(f"Symbol digits: {symbol_info.digits}")
 
-        # Send order request
-        result = mt5.order_send(request)
+def rebuild_order_request(request, order_type, order_kind, limit, sl, tp=None, snapshot=None):
+    """
+    Rebuild a request around a freshly fetched quote before it is resent, so
+    the autospread offset follows the market. Returns (request, reason) like
+    build_ladder_requests(): reason is set when it no longer passes the checks.
+    """
+    symbol = request["symbol"]
+    symbol_info = SPEC_STORE.get(symbol)
+    tick = QUOTE_CACHE.fresh(symbol)
+    rebuilt = build_order_request(
+        order_type,
+        order_kind,
+        request["volume"],
+        symbol,
+        limit,
+        sl,
+        tp=tp,
+        comment=request["comment"],
+        symbol_info=symbol_info,
+        tick=tick,
+        order_expiration=(request["type_time"], request["expiration"]),
+        snapshot=snapshot,
+    )
+    if rebuilt is None:
+        return None, "no symbol info or quote to rebuild the order"
+    problem = validate_order_request(rebuilt, symbol_info, tick)
+    if problem:
+        return None, problem[1]
+    return rebuilt, None
 
-        if result is None:
-            error_code = mt5.last_error()
-            print(f"Order failed with error code: {error_code}")
-            return False
 
-        # Check the return code to determine if the order was successful
-        # The TRADE_RETCODE_DONE is typically 10009
-        print(
-            f"Order result - retcode: {result.retcode}, description: {result.comment}"
+async def send_with_retries(request, deadline, rebuild=None):
+    """
+    Send one order and resend it after transient retcodes (requote, price
+    changed, throttling, lost connection) with jittered backoff, until the
+    retry policy's attempts or the signal's deadline run out. rebuild(request)
+    runs on the MT5 worker before each resend and returns (request, reason).
+    Returns (success, retcode, attempts, error).
+    """
+    attempts, error = 0, None
+    while True:
+        attempts += 1
+        success, retcode = await MT5_EXECUTOR.run(send_order_request, request)
+        if success or not is_retryable(retcode):
+            break
+        delay = RETRY_POLICY.next_delay(attempts, deadline)
+        if delay is None:
+            break
+
+        METRICS.increment("order_retries", retcode)
+        log.info(
+            "Resending order",
+            extra={"fields": {"symbol": request["symbol"], "retcode": retcode, "attempt": attempts + 1, "delay": delay}},
         )
+        await asyncio.sleep(delay)
+        if rebuild:
+            request, error = await MT5_EXECUTOR.run(rebuild, request)
+            if request is None:
+                break
 
-        if result.retcode == mt5.TRADE_RETCODE_DONE:
-            print(f"Order placed successfully: {result}")
-            return True
-        elif result.retcode == 10027:  # Likely a specific autotrading error code
-            print(
-                f"Order warning - retcode: {result.retcode}, comment: {result.comment}"
-            )
-            print(
-                "This may be due to autotrading being disabled. Please check if autotrading is enabled in MT5."
-            )
-            return False
-        else:
-            print(f"Order failed: {result.retcode} - {result.comment}")
-            return False
+    if attempts > 1:
+        METRICS.increment("order_retry_outcomes", "recovered" if success else "failed")
+    return success, retcode, attempts, error
+
+
+async def place_trades_batch(
+    order_type,
+    order_kind,
+    symbol,
+    limits,
+    volumes,
+    sl,
+    tps=None,
+    comment=None,
+    expiration=None,
+    snapshot=None,
+):
+    """
+    Places every order of a signal.
+    All requests are built up front in one MT5 worker job; each order is then
+    sent as its own job, so orders of other symbols can go out in between
+    instead of waiting for this whole ladder. Orders that fail with a
+    transient retcode are resent within one deadline for the whole signal.
+    Returns (results, total_seconds) where results holds one dict per limit
+    with success, retcode, attempts and latency, plus the reason in "error"
+    for a limit that failed local validation.
+    """
+    started = time.perf_counter()
+    deadline = RETRY_POLICY.start()
+    snapshot = snapshot or RISK_SNAPSHOT
+    results = []
 
+    try:
+        requests, rejections = await MT5_EXECUTOR.run(
+            build_ladder_requests,
+            order_type,
+            order_kind,
+            symbol,
+            limits,
+            volumes,
+            sl,
+            tps=tps,
+            comment=comment,
+            expiration=expiration,
+            snapshot=snapshot,
+        )
     except Exception as e:
-        print(f"Unexpected error in place_trade: {str(e)}")
-        return False
+        log.exception(f"Unexpected error building orders: {str(e)}")
+        return results, time.perf_counter() - started
+
+    for i, request in enumerate(requests):
+        sent = time.perf_counter()
+        success, retcode, attempts, error = False, None, 0, rejections[i]
+        if request is not None:
+            # With autospread the entry depends on the spread, so a resend is priced off a fresh quote
+            rebuild = None
+            if snapshot.autospread:
+                rebuild = functools.partial(
+                    rebuild_order_request,
+                    order_type=order_type,
+                    order_kind=order_kind,
+                    limit=limits[i],
+                    sl=sl,
+                    tp=tps[i] if tps else None,
+                    snapshot=snapshot,
+                )
+            try:
+                success, retcode, attempts, error = await send_with_retries(request, deadline, rebuild)
+            except Exception as e:
+                log.exception(f"Unexpected error sending order {i + 1}: {str(e)}")
+        result = {
+            "limit": limits[i],
+            "success": success,
+            "retcode": retcode,
+            "attempts": attempts,
+            "latency": time.perf_counter() - sent,
+        }
+        if error:
+            result["error"] = error
+        results.append(result)
 
+    # Orders are resting on this account now; watch for them to fill
+    if any(result["success"] for result in results):
+        ACCOUNT_CACHE.watch_fills()
 
-def get_volumes_for_limits(symbol, limits, stop_loss, position):
+    return results, time.perf_counter() - started
+
+
+def get_sizing_profile(symbol, num_limits, config_name=None, mode=None, snapshot=None):
     """
-    Calculate volumes for each limit based on current configuration
+    Return (mode, values) for a ladder: the volumes themselves in fixed mode,
+    the risk percentage per limit in risk mode. Defaults to the active
+    configuration and mode; accounts in config.json can override both.
+    Values come from the compiled risk snapshot (the current one by default).
     """
-    active_config_name = risk_config.get("active_config", "default")
-    mode = risk_config.get("mode", "risk")
+    snapshot = snapshot or RISK_SNAPSHOT
+    mode = mode or snapshot.mode
 
     # Get the active configuration
-    active_config = risk_config.get("configs", {}).get(active_config_name, {})
-    if not active_config:
-        print(
-            f"Warning: Configuration '{active_config_name}' not found. Using default."
+    tables, found = snapshot.sizing_tables(config_name)
+    if not found:
+        log.warning(
+            f"Configuration '{config_name or snapshot.active_config}' not found. Using default."
         )
-        active_config = risk_config.get("configs", {}).get("default", {})
 
-    num_limits = str(len(limits))
+    if mode == "fixed":
+        volumes = tables.fixed_lots.values(num_limits, snapshot.ladder_rule)
+        if num_limits <= MAX_CONFIGURED_LIMITS:
+            return mode, volumes.tolist()
 
-    if num_limits not in ["1", "2", "3", "4", "5", "6", "7", "8"]:
-        print(
-            f"Warning: Unsupported number of limits: {num_limits}. Using default for 1 limit."
-        )
-        num_limits = "1"
+        # Longer ladders split the largest configured profile by the ladder rule
+        symbol_info = SPEC_STORE.get(symbol)
+        return mode, round_volumes(volumes, symbol_info) if symbol_info else volumes.tolist()
+    else:  # mode == "risk"
+        return "risk", tables.risk_percentages.values(num_limits, snapshot.ladder_rule)
 
+
+@METRICS.timed("get_volumes_for_limits")
+def get_volumes_for_limits(symbol, limits, stop_loss, position, snapshot=None):
+    """
+    Calculate volumes for each limit based on current configuration
+    """
+    num_limits = len(limits)
+    snapshot = snapshot or RISK_SNAPSHOT
+    mode, values = get_sizing_profile(symbol, num_limits, snapshot=snapshot)
     if mode == "fixed":
-        # Get fixed lots configuration
-        fixed_lots = active_config.get("fixed_lots", DEFAULT_FIXED_LOTS)
-        volumes = fixed_lots.get(num_limits, [0.1] * int(num_limits))
-        return volumes
-    else:  # mode == "risk"
-        # Get risk percentages configuration
-        risk_percentages = active_config.get(
-            "risk_percentages", DEFAULT_RISK_PERCENTAGES
-        )
-        risk_percents = risk_percentages.get(num_limits, [1.0] * int(num_limits))
+        return values
 
-        # Get account balance
-        account_info = mt5.account_info()
-        if not account_info:
-            print("Failed to get account info")
-            return [0.1] * len(limits)
+    # Get account balance (or equity / free margin) from the account snapshot
+    balance = ACCOUNT_CACHE.sizing_value(snapshot.sizing_basis)
+    if balance is None:
+        log.error("Failed to get account info")
+        return [0.1] * num_limits
 
-        balance = account_info.balance
+    symbol_info = SPEC_STORE.get(symbol)
+    if not symbol_info:
+        log.warning(f"Symbol info not found for {symbol}. Using 0.1 for every limit")
+        return [0.1] * num_limits
 
-        # Calculate volumes based on risk percentages
-        volumes = []
-        for i, limit in enumerate(limits):
-            vol = calculate_lot_size(
-                balance, risk_percents[i], symbol, float(limit), float(stop_loss)
+    # Calculate volumes for the whole ladder in one pass
+    volumes = calculate_lot_sizes(
+        balance, values, limits, stop_loss, symbol_info
+    )
+    for i, vol in enumerate(volumes):
+        if vol is None:
+            log.warning(
+                f"Failed to calculate lot size for limit {i + 1}. Using 0.1"
             )
-            if vol is None:
-                print(
-                    f"Warning: Failed to calculate lot size for limit {i + 1}. Using 0.1"
-                )
-                vol = 0.1
-            volumes.append(vol)
+            volumes[i] = 0.1
 
-        return volumes
+    log.info(f"Calculated lot sizes for {symbol}: {volumes}")
+    return volumes
+
+
+def build_fanout_plans(
+    order_type, order_kind, symbol, limits, sl, tps=None, comment=None, expiration=None, snapshot=None
+):
+    """
+    Build the order requests of a signal once and one plan per configured
+    account: the requests plus that account's sizing profile. Volumes are
+    filled in (and checked) by each account's worker from its own balance.
+    Returns (plans, rejections) as in build_ladder_requests().
+    """
+    snapshot = snapshot or RISK_SNAPSHOT
+    symbol_info = SPEC_STORE.get(symbol)
+    if not symbol_info:
+        raise ValueError(f"Symbol info not found for {symbol}")
+    requests, rejections = build_ladder_requests(
+        order_type,
+        order_kind,
+        symbol,
+        limits,
+        [0.0] * len(limits),
+        sl,
+        tps=tps,
+        comment=comment,
+        expiration=expiration,
+        check_volumes=False,
+        snapshot=snapshot,
+    )
+
+    plans = {}
+    for account in ACCOUNT_POOL.accounts:
+        mode, values = get_sizing_profile(
+            symbol, len(limits), account.get("config"), account.get("mode"), snapshot
+        )
+        plans[account["name"]] = {
+            "requests": requests,
+            "limits": [float(limit) for limit in limits],
+            "sl": float(sl),
+            "symbol": symbol,
+            "mode": mode,
+            "values": [float(value) for value in values],
+            "basis": account.get("sizing_basis", snapshot.sizing_basis),
+            "retry": RETRY_POLICY.as_dict(),
+        }
+    return plans, rejections
 
 
 def process_config_command(message_content):
@@ -821,6 +1435,9 @@ def process_config_command(message_content):
             "`config show <name>` - Show details of a specific configuration\n"
             "`config set mode <fixed|risk>` - Set the active mode\n"
             "`config set active <name>` - Set the active configuration\n"
+            "`config set ladder <equal|weighted>` - Set how ladders over 8 limits split risk\n"
+            "`config set basis <balance|equity|margin>` - Set what risk percentages are sized against\n"
+            "`config set log <info|debug>` - Set log level (debug includes order request dumps)\n"
             "`config create <name>` - Create a new configuration\n"
             "`config delete <name>` - Delete a configuration\n"
             "`config set fixed <name> <limits> <values>` - Set fixed lot values\n"
@@ -832,7 +1449,9 @@ def process_config_command(message_content):
             "`add <stock_symbol>` - Add a stock symbol for TP configuration\n"
             "Example: `add AAPL.NAS` - Adds Apple stock to TP configuration\n\n"
             "Other commands:\n"
-            "`autospread on/off` - Enable/disable automatic spread adjustment for limit orders"
+            "`autospread on/off` - Enable/disable automatic spread adjustment for limit orders\n"
+            "`specs` / `specs refresh` - Show or reload cached symbol specifications\n"
+            "`symbols refresh` - Pick up symbols the broker added or removed"
         )
         return help_text
 
@@ -846,7 +1465,9 @@ def process_config_command(message_content):
         if not configs:
             return "No configurations found."
 
-        return f"Mode: {mode}\nActive: {active_config}\nAutospread: {autospread}\nConfigurations: {', '.join(configs)}"
+        ladder_rule = risk_config.get("ladder_rule", "equal")
+        sizing_basis = risk_config.get("sizing_basis", "balance")
+        return f"Mode: {mode}\nActive: {active_config}\nAutospread: {autospread}\nLadder rule: {ladder_rule}\nSizing basis: {sizing_basis}\nConfigurations: {', '.join(configs)}"
 
     # Show configuration details
     elif command == "show" and len(parts) >= 3:
@@ -882,6 +1503,43 @@ def process_config_command(message_content):
         save_risk_config()
         return f"Mode set to: {mode}"
 
+    # Set ladder rule for ladders longer than the configured profiles
+    elif (
+        command == "set" and len(parts) >= 3 and parts[2] == "ladder" and len(parts) >= 4
+    ):
+        rule = parts[3]
+        if rule not in LADDER_RULES:
+            return "Invalid ladder rule. Use 'equal' or 'weighted'."
+
+        risk_config["ladder_rule"] = rule
+        save_risk_config()
+        return f"Ladder rule for more than {MAX_CONFIGURED_LIMITS} limits set to: {rule}"
+
+    # Set log level
+    elif (
+        command == "set" and len(parts) >= 3 and parts[2] == "log" and len(parts) >= 4
+    ):
+        level = parts[3]
+        if level not in ["info", "debug"]:
+            return "Invalid log level. Use 'info' or 'debug'."
+
+        risk_config["log_level"] = level
+        set_log_level(level)
+        save_risk_config()
+        return f"Log level set to: {level}"
+
+    # Set the account value risk is sized against
+    elif (
+        command == "set" and len(parts) >= 3 and parts[2] == "basis" and len(parts) >= 4
+    ):
+        basis = parts[3]
+        if basis not in SIZING_BASIS_FIELDS:
+            return "Invalid sizing basis. Use 'balance', 'equity' or 'margin'."
+
+        risk_config["sizing_basis"] = basis
+        save_risk_config()
+        return f"Risk sizing basis set to: {basis}"
+
     # Set active configuration
     elif (
         command == "set"
@@ -1071,6 +1729,58 @@ def process_autospread_command(message_content):
         return "Autospread disabled. Limit prices will be used as specified."
 
 
+def process_specs_command(message_content):
+    """Process specs command to show or reload the symbol specification store"""
+    parts = message_content.strip().lower().split()
+
+    if len(parts) >= 2 and parts[1] == "refresh":
+        catalog = load_live_catalog()
+        if catalog is None:
+            return f"Failed to get symbols from MT5, keeping the {len(SPEC_STORE)} cached specifications."
+        # Keep the snapshot write off the MT5 worker
+        threading.Thread(target=save_catalog_snapshot, args=(catalog,), name="catalog-snapshot").start()
+        count = len(SPEC_STORE)
+        return f"Reloaded specifications for {count} symbols ({SPEC_STORE.memory_usage() / 1024:.1f} KiB)."
+
+    if len(parts) == 1:
+        return f"Specifications cached for {len(SPEC_STORE)} symbols ({SPEC_STORE.memory_usage() / 1024:.1f} KiB)."
+
+    # Anything else is not this command; let it reach the signal parser
+    return None
+
+
+def process_symbols_command(message_content):
+    """Process symbols command to show or incrementally refresh the symbol catalog"""
+    parts = message_content.strip().lower().split()
+
+    if len(parts) >= 2 and parts[1] == "refresh":
+        try:
+            added, removed, changed, seconds = refresh_symbols()
+        except Exception as e:
+            return f"Error: {str(e)}"
+        if not added and not removed and not changed:
+            return f"Symbol catalog unchanged ({len(AVAILABLE_SYMBOLS)} symbols, checked in {seconds * 1000:.0f} ms)."
+
+        def preview(names):
+            shown = ", ".join(names[:10])
+            return shown + (f" and {len(names) - 10} more" if len(names) > 10 else "")
+
+        response = f"Symbol catalog updated in {seconds * 1000:.0f} ms: {len(AVAILABLE_SYMBOLS)} symbols"
+        if added:
+            response += f"\nAdded ({len(added)}): {preview(added)}"
+        if removed:
+            response += f"\nRemoved ({len(removed)}): {preview(removed)}"
+        if changed:
+            response += f"\nTrading rules changed ({len(changed)}): {preview(changed)}"
+        return response
+
+    if len(parts) == 1:
+        return f"{len(AVAILABLE_SYMBOLS)} symbols available."
+
+    # Anything else is not this command; let it reach the signal parser
+    return None
+
+
 def process_help_command():
     """Process help command to display available commands"""
     help_text = (
@@ -1080,6 +1790,9 @@ def process_help_command():
         "`config show <name>` - Show details of a specific configuration\n"
         "`config set mode <fixed|risk>` - Set the active mode\n"
         "`config set active <name>` - Set the active configuration\n"
+        "`config set ladder <equal|weighted>` - Set how ladders over 8 limits split risk\n"
+        "`config set basis <balance|equity|margin>` - Set what risk percentages are sized against\n"
+        "`config set log <info|debug>` - Set log level (debug includes order request dumps)\n"
         "`config create <name>` - Create a new configuration\n"
         "`config delete <name>` - Delete a configuration\n"
         "`config set fixed <name> <limits> <values>` - Set fixed lot values\n"
@@ -1093,66 +1806,256 @@ def process_help_command():
         "Example: `add AAPL.NAS` - Adds Apple stock to TP configuration\n\n"
         "**Autospread Command:**\n"
         "`autospread on/off` - Enable/disable automatic spread adjustment for limit orders\n\n"
+        "**Symbol Commands:**\n"
+        "`specs` - Show the cached symbol specifications\n"
+        "`specs refresh` - Reload symbol specifications from MT5\n"
+        "`symbols refresh` - Apply symbols added or removed by the broker since the last load\n"
+        "`filter` - Show how many chat messages were dropped as non-signals or duplicates\n"
+        "`stats` - Show per-stage latency percentiles and order retcodes\n\n"
         "**Help Command:**\n"
         "`help` - Display this help message"
     )
     return help_text
 
 
+def process_filter_command():
+    """Report how many messages the signal pre-filter dropped"""
+    return (
+        f"Dropped {MESSAGE_COUNTS['rejected']} non-signal messages. "
+        f"Processed {MESSAGE_COUNTS['signals']} signals and {MESSAGE_COUNTS['commands']} commands. "
+        f"Ignored {MESSAGE_COUNTS['duplicates']} duplicate signals ({sum(SUPPRESSED_ORDERS.values())} orders)."
+    )
+
+
+# Command dispatch table: first word -> (handler(content, args), runs on the MT5 worker).
+# A handler returns None when the message is not a valid form of its command.
+COMMAND_TABLE = {
+    "help": (lambda content, args: None if args else process_help_command(), False),
+    "config": (lambda content, args: process_config_command(content) if args else None, False),
+    "tp": (
+        lambda content, args: (
+            process_tp_config_command()
+            if args.lower() == "config"
+            else process_tp_command(content) if args else None
+        ),
+        False,
+    ),
+    "autospread": (
+        lambda content, args: process_autospread_command(content) if args else None,
+        False,
+    ),
+    "add": (lambda content, args: process_add_command(content) if args else None, False),
+    "specs": (lambda content, args: process_specs_command(content), True),
+    "symbols": (lambda content, args: process_symbols_command(content), True),
+    "filter": (lambda content, args: None if args else process_filter_command(), False),
+    "stats": (lambda content, args: None if args else METRICS.summary(), False),
+}
+
+# Message counters: dropped chatter, processed signals and commands
+MESSAGE_COUNTS = METRICS.counter("messages")
+
+# Reposted or cross-posted signals are dropped before sizing; suppressed orders are counted per symbol
+SIGNAL_DEDUP = SignalDeduplicator(ttl=float(risk_config.get("duplicate_window", 300)))
+SUPPRESSED_ORDERS = METRICS.counter("suppressed_orders", label="symbol")
+
+# Per-symbol signal queues; queue wait and depth show up in `stats` and the metrics endpoint
+SYMBOL_SCHEDULER = SymbolScheduler(int(risk_config.get("max_concurrent_symbols", 4)), METRICS)
+METRICS.gauge("symbol_queue_depth", SYMBOL_SCHEDULER.depths, label="symbol")
+
+# Replies are queued per channel and sent by their own tasks, merged while rate limited
+REPLY_QUEUE = ReplyQueue(
+    rate=float(risk_config.get("reply_rate", 1.0)),
+    burst=int(risk_config.get("reply_burst", 5)),
+    metrics=METRICS,
+)
+METRICS.gauge("reply_queue_depth", REPLY_QUEUE.depths, label="channel")
+
+
+async def watch_mt5_startup():
+    # MT5 initializes concurrently with the Discord login; without it there is nothing to trade on
+    if not await asyncio.wrap_future(MT5_STARTUP):
+        log.error("MT5 initialization failed, shutting down")
+        await client.close()
+
+
 @client.event
-async def on_ready():
-    print(f"Logged in as {client.user.name} ({client.user.id})")
-    print(f'Active configuration: {risk_config.get("active_config", "default")}')
-    print(f'Mode: {risk_config.get("mode", "risk")}')
-    print("------")
+async def setup_hook():
+    global MT5_STARTUP_WATCH
+    MT5_STARTUP_WATCH = asyncio.create_task(watch_mt5_startup())
 
 
 @client.event
-async def on_message(message):
-    if message.author == client.user:
-        return
+async def on_ready():
+    log.info(f"Logged in as {client.user.name} ({client.user.id})")
+    log.info(f'Active configuration: {risk_config.get("active_config", "default")}')
+    log.info(f'Mode: {risk_config.get("mode", "risk")}')
 
-    content = message.content.strip()
 
-    # Process help command
-    if content.lower() == "help":
-        response = process_help_command()
-        await message.channel.send(response)
-        return
+async def execute_signal(message, symbol, position, limits, stop_loss, expiry, comments):
+    """
+    Size and place a parsed signal and report back; runs in the symbol's queue.
+    Returns the number of orders placed, summed over accounts when fanning out.
+    """
+    num_limits = len(limits)
 
-    # Process configuration commands
-    if content.lower().startswith("config "):
-        response = process_config_command(content)
-        await message.channel.send(response)
-        return
+    # One view of the risk configuration for the whole signal, even if a command changes it meanwhile
+    snapshot = RISK_SNAPSHOT
 
-    # Process take profit configuration command
-    if content.lower() == "tp config":
-        response = process_tp_config_command()
-        await message.channel.send(response)
-        return
+    # Calculate take profit for each limit
+    tps = [
+        calculate_take_profit(symbol, limit, position, i, snapshot)
+        for i, limit in enumerate(limits)
+    ]
+
+    if ACCOUNT_POOL:
+        reply, trades_placed = await fan_out_signal(
+            symbol, position, limits, stop_loss, tps, comments, expiry, snapshot
+        )
+        REPLY_QUEUE.post(message.channel, reply)
+        return trades_placed
+
+    # Calculate volumes for each limit
+    volumes = await MT5_EXECUTOR.run(
+        get_volumes_for_limits, symbol, limits, stop_loss, position, snapshot
+    )
+
+    # Place all trades of the signal, one MT5 worker job per order
+    results, total_seconds = await place_trades_batch(
+        order_type=position,
+        order_kind="LIMIT",
+        symbol=symbol,
+        limits=limits,
+        volumes=volumes,
+        sl=stop_loss,
+        tps=tps,
+        comment=comments,
+        expiration=expiry,
+        snapshot=snapshot,
+    )
+    trades_placed = sum(1 for result in results if result["success"])
+    order_latencies = " ".join(
+        f"{result['latency'] * 1000:.0f}" for result in results
+    )
+
+    # Report on trade placement
+    active_config = snapshot.active_config
+    mode = snapshot.mode
+    reply = (
+        f"Placed {trades_placed}/{num_limits} trades using {mode} mode with '{active_config}' configuration "
+        f"in {total_seconds * 1000:.0f} ms (per order ms: {order_latencies})"
+    )
+    resends = sum(max(0, result["attempts"] - 1) for result in results)
+    if resends:
+        reply += f", {resends} resent after transient errors"
+    rejected = format_rejections(limits, [result.get("error") for result in results])
+    REPLY_QUEUE.post(message.channel, "\n".join([reply] + rejected))
+    return trades_placed
+
+
+def format_rejections(limits, rejections):
+    """Reply lines for limits that failed local validation and were not sent."""
+    return [
+        f"Limit {i + 1} ({limits[i]}) not sent: {reason}"
+        for i, reason in enumerate(rejections)
+        if reason
+    ]
 
-    # Process take profit commands
-    if content.lower().startswith("tp "):
-        response = process_tp_command(content)
-        await message.channel.send(response)
-        return
 
-    # Process autospread commands
-    if content.lower().startswith("autospread "):
-        response = process_autospread_command(content)
-        await message.channel.send(response)
+async def fan_out_signal(symbol, position, limits, stop_loss, tps, comments, expiry, snapshot=None):
+    """
+    Send a parsed signal to every configured account.
+    Returns the combined reply and the number of orders placed across accounts.
+    """
+    started = time.perf_counter()
+    plans, rejections = await MT5_EXECUTOR.run(
+        build_fanout_plans,
+        order_type=position,
+        order_kind="LIMIT",
+        symbol=symbol,
+        limits=limits,
+        sl=stop_loss,
+        tps=tps,
+        comment=comments,
+        expiration=expiry,
+        snapshot=snapshot,
+    )
+    outcomes = await ACCOUNT_POOL.execute(plans)
+    total_seconds = time.perf_counter() - started
+    METRICS.observe("fanout", total_seconds)
+
+    lines = [f"{symbol} {position} sent to {len(outcomes)} accounts in {total_seconds * 1000:.0f} ms"]
+    lines += format_rejections(limits, rejections)
+    total_placed = 0
+    for name, outcome in outcomes.items():
+        if outcome.get("error"):
+            log.error("Account failed", extra={"fields": {"account": name, "error": outcome["error"]}})
+            lines.append(f"**{name}**: error: {outcome['error']}")
+            continue
+
+        results = outcome["results"]
+        placed = sum(1 for result in results if result["success"])
+        total_placed += placed
+        for result in results:
+            METRICS.increment("order_retcodes", result["retcode"] if result["retcode"] is not None else "none")
+            for retcode in result.get("retried", ()):
+                METRICS.increment("order_retries", retcode)
+            if result.get("retried"):
+                METRICS.increment("order_retry_outcomes", "recovered" if result["success"] else "failed")
+        METRICS.observe(f"account_{name}", outcome["seconds"])
+        log.info(
+            "Account orders",
+            extra={"fields": {"account": name, "placed": placed, "retcodes": [r["retcode"] for r in results]}},
+        )
+        order_latencies = " ".join(f"{result['latency'] * 1000:.0f}" for result in results)
+        lines.append(
+            f"**{name}**: placed {placed}/{len(results)} in {outcome['seconds'] * 1000:.0f} ms "
+            f"(per order ms: {order_latencies})"
+        )
+        rejected = format_rejections(limits, [result.get("error") for result in results])
+        lines.extend(f"  {line}" for line in rejected)
+    return "\n".join(lines), total_placed
+
+
+@client.event
+async def on_message(message):
+    if message.author == client.user:
         return
 
-    # Process add commands for stock symbols
-    if content.lower().startswith("add "):
-        response = process_add_command(content)
-        await message.channel.send(response)
+    content = message.content.strip()
+
+    # Process commands, looked up by their first word
+    dispatch_started = time.perf_counter()
+    command_word, _, args = content.partition(" ")
+    command = COMMAND_TABLE.get(command_word.lower())
+    if command:
+        dispatch_seconds = time.perf_counter() - dispatch_started
+        handler, on_mt5_worker = command
+        if on_mt5_worker:
+            response = await MT5_EXECUTOR.run(handler, content, args.strip())
+        else:
+            response = handler(content, args.strip())
+        if response is not None:
+            METRICS.observe("dispatch", dispatch_seconds)
+            MESSAGE_COUNTS["commands"] += 1
+            REPLY_QUEUE.post(message.channel, response)
+            return
+
+    # Drop chatter before it reaches the signal parser
+    is_signal = looks_like_signal(content)
+    METRICS.observe("dispatch", time.perf_counter() - dispatch_started)
+    if not is_signal:
+        MESSAGE_COUNTS["rejected"] += 1
         return
+    MESSAGE_COUNTS["signals"] += 1
+
+    # Every log line of this signal carries its correlation id
+    new_signal_id()
+    log.info("Signal received", extra={"fields": {"channel": str(message.channel)}})
 
     # Process trading signals
     try:
-        trade_signal = parse_tm_signal(content)
+        # Parsing, sizing and order placement call MT5, so they run on the MT5 worker
+        trade_signal = await MT5_EXECUTOR.run(parse_tm_signal, content)
         symbol = trade_signal[0]
         position = trade_signal[1]
         limits = trade_signal[2]
@@ -1160,49 +2063,57 @@ async def on_message(message):
         expiry = trade_signal[4]
         comments = trade_signal[5]
 
-        num_limits = len(limits)
-
-        # Calculate volumes for each limit
-        volumes = get_volumes_for_limits(symbol, limits, stop_loss, position)
-
-        # Place trades
-        trades_placed = 0
-        for i, limit in enumerate(limits):
-            if i < len(volumes):
-                volume = volumes[i]
-                # Calculate take profit for this limit
-                tp = calculate_take_profit(symbol, limit, position, i)
-
-                success = place_trade(
-                    order_type=position,
-                    order_kind="LIMIT",
-                    symbol=symbol,
-                    volume=volume,
-                    entry_price=limit,
-                    sl=stop_loss,
-                    tp=tp,
-                    comment=comments,
-                    expiration=expiry,
-                )
-                if success:
-                    trades_placed += 1
-
-        # Report on trade placement
-        active_config = risk_config.get("active_config", "default")
-        mode = risk_config.get("mode", "risk")
-        await message.channel.send(
-            f"Placed {trades_placed}/{num_limits} trades using {mode} mode with '{active_config}' configuration"
+        # Skip reposts of a signal we already acted on, before anything is sized or sent
+        symbol_info = SPEC_STORE.get(symbol)
+        fingerprint = signal_fingerprint(
+            symbol, position, limits, stop_loss, symbol_info.digits if symbol_info else 8
         )
+        first_seen = SIGNAL_DEDUP.check(fingerprint)
+        if first_seen is not None:
+            MESSAGE_COUNTS["duplicates"] += 1
+            SUPPRESSED_ORDERS[symbol] += len(limits)
+            log.info("Duplicate signal suppressed", extra={"fields": {"symbol": symbol, "orders": len(limits)}})
+            REPLY_QUEUE.post(
+                message.channel,
+                f"Duplicate of a {symbol} {position} signal from {first_seen:.0f} s ago, ignored.",
+            )
+            return
 
-    except ValueError as e:
-        await message.channel.send(f"Error: {str(e)}")
-    except Exception as e:
-        print(f"Unexpected error: {str(e)}")
-        await message.channel.send(f"Unexpected error: {str(e)}")
-
+        # Keep the symbol's quote warm for this and follow-up signals
+        QUOTE_CACHE.touch(symbol)
 
-# Start the Discord bot
-client.run(DISCORD_TOKEN)
+        # Signals for one symbol run in order; other symbols do not wait for them
+        try:
+            trades_placed = await SYMBOL_SCHEDULER.run(
+                symbol, execute_signal, message, symbol, position, limits, stop_loss, expiry, comments
+            )
+        except Exception:
+            # Nothing reliable was placed, so let a repost through
+            SIGNAL_DEDUP.forget(fingerprint)
+            raise
+        if not trades_placed:
+            # Every order failed; a repost is the retry, not a duplicate
+            SIGNAL_DEDUP.forget(fingerprint)
 
-# Shutdown MetaTrader 5 on exit
-mt5.shutdown()
+    except ValueError as e:
+        log.info(f"Signal rejected: {str(e)}")
+        REPLY_QUEUE.post(message.channel, f"Error: {str(e)}")
+    except Exception as e:
+        log.exception(f"Unexpected error: {str(e)}")
+        REPLY_QUEUE.post(message.channel, f"Unexpected error: {str(e)}")
+
+
+if __name__ == "__main__":
+    # Start the Discord bot
+    client.run(DISCORD_TOKEN)
+
+    # Flush pending settings, stop the quote poller and shutdown MetaTrader 5 on exit
+    SETTINGS_WRITER.close()
+    SYMBOL_REFRESH_STOP.set()
+    if ACCOUNT_POOL:
+        ACCOUNT_POOL.close()
+    QUOTE_CACHE.stop()
+    ACCOUNT_CACHE.stop()
+    MT5_EXECUTOR.call(mt5.shutdown)
+    MT5_EXECUTOR.shutdown()
+    shutdown_logging()
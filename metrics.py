@@ -0,0 +1,218 @@
+"""
+Low-overhead latency histograms and counters for the signal-to-order path.
+
+Each stage records into a fixed set of log-spaced buckets (one bisect and a
+few increments per observation). Percentiles are estimated from the buckets.
+Gauges are read from callbacks when rendered. The registry renders a chat
+summary for the `stats` command and Prometheus text for the optional local
+HTTP endpoint.
+"""
+
+import bisect
+import functools
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from bot_logging import get_logger
+
+log = get_logger("metrics")
+
+
+def _bucket_bounds(low=0.00001, high=60.0, factor=1.2):
+    """Upper bounds in seconds, from 10us to about a minute."""
+    bounds = []
+    bound = low
+    while bound < high:
+        bounds.append(bound)
+        bound *= factor
+    bounds.append(high)
+    return bounds
+
+
+BUCKET_BOUNDS = _bucket_bounds()
+
+
+class LatencyHistogram:
+    """Fixed-bucket histogram of durations in seconds."""
+
+    def __init__(self, bounds=BUCKET_BOUNDS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # last bucket is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds):
+        index = bisect.bisect_left(self.bounds, seconds)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += seconds
+
+    def quantile(self, q):
+        """Estimate the q-quantile (0..1) by interpolating inside its bucket."""
+        with self._lock:
+            counts, total = list(self.counts), self.count
+        if not total:
+            return None
+
+        rank = q * total
+        cumulative = 0
+        for index, bucket_count in enumerate(counts):
+            if bucket_count and cumulative + bucket_count >= rank:
+                lower = self.bounds[index - 1] if index > 0 else 0.0
+                upper = self.bounds[index] if index < len(self.bounds) else self.bounds[-1]
+                return lower + (upper - lower) * (rank - cumulative) / bucket_count
+            cumulative += bucket_count
+        return self.bounds[-1]
+
+
+class Metrics:
+    """Registry of per-stage latency histograms and labelled counters."""
+
+    def __init__(self, namespace="bot"):
+        self.namespace = namespace
+        self.histograms = {}
+        self.counters = {}  # name -> (label name, Counter)
+        self.gauges = {}  # name -> (label name, callable returning {label value: number})
+        self._lock = threading.Lock()
+
+    def histogram(self, stage):
+        histogram = self.histograms.get(stage)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(stage, LatencyHistogram())
+        return histogram
+
+    def observe(self, stage, seconds):
+        self.histogram(stage).observe(seconds)
+
+    @contextmanager
+    def timer(self, stage):
+        """Time the body of a with-block into the stage histogram."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.histogram(stage).observe(time.perf_counter() - started)
+
+    def timed(self, stage):
+        """Decorator that times every call of a function into the stage histogram."""
+
+        def decorator(fn):
+            histogram = self.histogram(stage)
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    histogram.observe(time.perf_counter() - started)
+
+            return wrapper
+
+        return decorator
+
+    def counter(self, name, label="kind"):
+        """Return the Counter registered under name, creating it if needed."""
+        with self._lock:
+            if name not in self.counters:
+                self.counters[name] = (label, Counter())
+            return self.counters[name][1]
+
+    def gauge(self, name, read, label="kind"):
+        """Register a gauge whose current values come from read() at render time."""
+        with self._lock:
+            self.gauges[name] = (label, read)
+
+    def _read_gauges(self):
+        for name, (label, read) in list(self.gauges.items()):
+            try:
+                yield name, label, dict(read())
+            except Exception as e:
+                log.warning(f"Error reading gauge {name}: {str(e)}")
+
+    def increment(self, name, key, amount=1):
+        counter = self.counter(name)
+        with self._lock:
+            counter[key] += amount
+
+    def summary(self):
+        """Human-readable summary for the stats command."""
+        lines = ["**Latency (ms)**  count | p50 | p95 | p99"]
+        for stage, histogram in list(self.histograms.items()):
+            if not histogram.count:
+                continue
+            p50, p95, p99 = (histogram.quantile(q) * 1000 for q in (0.5, 0.95, 0.99))
+            lines.append(f"`{stage}`: {histogram.count} | {p50:.2f} | {p95:.2f} | {p99:.2f}")
+
+        for name, (_, counter) in list(self.counters.items()):
+            if counter:
+                values = ", ".join(f"{key}: {value}" for key, value in sorted(counter.items(), key=str))
+                lines.append(f"**{name}**: {values}")
+
+        for name, _, values in self._read_gauges():
+            if values:
+                shown = ", ".join(f"{key}: {value}" for key, value in sorted(values.items(), key=str))
+                lines.append(f"**{name}**: {shown}")
+        return "\n".join(lines)
+
+    def prometheus_text(self):
+        """Render all metrics in the Prometheus text exposition format."""
+        ns = self.namespace
+        lines = [
+            f"# HELP {ns}_stage_latency_seconds Latency of each signal-to-order stage.",
+            f"# TYPE {ns}_stage_latency_seconds histogram",
+        ]
+        for stage, histogram in list(self.histograms.items()):
+            with histogram._lock:
+                counts, total, total_sum = list(histogram.counts), histogram.count, histogram.sum
+            cumulative = 0
+            for bound, bucket_count in zip(histogram.bounds, counts):
+                cumulative += bucket_count
+                lines.append(
+                    f'{ns}_stage_latency_seconds_bucket{{stage="{stage}",le="{bound:.6g}"}} {cumulative}'
+                )
+            lines.append(f'{ns}_stage_latency_seconds_bucket{{stage="{stage}",le="+Inf"}} {total}')
+            lines.append(f'{ns}_stage_latency_seconds_sum{{stage="{stage}"}} {total_sum}')
+            lines.append(f'{ns}_stage_latency_seconds_count{{stage="{stage}"}} {total}')
+
+        for name, (label, counter) in list(self.counters.items()):
+            lines.append(f"# TYPE {ns}_{name}_total counter")
+            for key, value in sorted(counter.items(), key=str):
+                lines.append(f'{ns}_{name}_total{{{label}="{key}"}} {value}')
+
+        for name, label, values in self._read_gauges():
+            lines.append(f"# TYPE {ns}_{name} gauge")
+            for key, value in sorted(values.items(), key=str):
+                lines.append(f'{ns}_{name}{{{label}="{key}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+
+def start_metrics_server(metrics, port, host="127.0.0.1"):
+    """Serve metrics.prometheus_text() on http://host:port/metrics from a daemon thread."""
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = metrics.prometheus_text().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            log.debug("metrics endpoint: " + format, *args)
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    thread = threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True)
+    thread.start()
+    log.info(f"Serving metrics on http://{host}:{port}/metrics")
+    return server
@@ -0,0 +1,30 @@
+"""
+Selects the MetaTrader5 implementation the bot talks to.
+
+By default this is the real MetaTrader5 package. Set MT5_SIMULATOR=1 to use
+the in-process simulator instead (no terminal needed, e.g. on Linux or for
+load tests). MT5_SIMULATOR may also be the path of a JSON file with simulator
+options such as catalog_size, balance, latency and reject_rate.
+"""
+
+import json
+import os
+
+
+def load_mt5():
+    setting = os.environ.get("MT5_SIMULATOR", "").strip()
+    if setting.lower() in ("", "0", "false", "no"):
+        import MetaTrader5
+
+        return MetaTrader5
+
+    from mt5_simulator import MT5Simulator
+
+    options = {}
+    if setting.lower() not in ("1", "true", "yes"):
+        with open(setting, "r") as f:
+            options = json.load(f)
+    return MT5Simulator(**options)
+
+
+mt5 = load_mt5()
@@ -0,0 +1,64 @@
+"""
+Dedicated executor for MetaTrader 5 calls.
+
+The terminal API is not safe to drive from many threads at once, so every
+MT5 call goes through a single worker thread that owns the session. Coroutines
+await work on it with run(); other threads block on it with call().
+"""
+
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class MT5Executor:
+    """Single worker thread that serializes all MT5 work through its queue."""
+
+    def __init__(self, name="mt5-worker"):
+        self._worker_ident = None
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix=name, initializer=self._bind
+        )
+
+    def _bind(self):
+        self._worker_ident = threading.get_ident()
+
+    def in_worker(self):
+        """True when called from the MT5 worker thread itself."""
+        return threading.get_ident() == self._worker_ident
+
+    @property
+    def pending(self):
+        """Number of submitted calls that have not finished yet."""
+        return self._pending
+
+    def submit(self, fn, *args, **kwargs):
+        """Queue fn on the worker thread and return a concurrent.futures.Future."""
+        with self._lock:
+            self._pending += 1
+        # Run in a copy of the caller's context so the signal's correlation id follows the work
+        context = contextvars.copy_context()
+        future = self._pool.submit(context.run, fn, *args, **kwargs)
+        future.add_done_callback(self._done)
+        return future
+
+    def _done(self, _future):
+        with self._lock:
+            self._pending -= 1
+
+    def call(self, fn, *args, **kwargs):
+        """Run fn on the worker thread and block for the result."""
+        # Nested calls from work already running on the worker must not queue behind themselves
+        if self.in_worker():
+            return fn(*args, **kwargs)
+        return self.submit(fn, *args, **kwargs).result()
+
+    async def run(self, fn, *args, **kwargs):
+        """Awaitable wrapper: run fn on the worker thread without blocking the event loop."""
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    def shutdown(self, wait=True):
+        self._pool.shutdown(wait=wait)
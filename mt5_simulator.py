@@ -0,0 +1,397 @@
+"""
+In-process stand-in for the MetaTrader5 module.
+
+Covers the calls and constants the bot uses so it can run and be load-tested
+without a terminal: a configurable symbol catalog, random-walk quotes, a
+pending-order book, per-call latency injection and scripted or random
+rejection retcodes. Select it with the MT5_SIMULATOR switch (see mt5_backend).
+"""
+
+import math
+import random
+import string
+import threading
+import time
+from collections import deque, namedtuple
+
+from bot_logging import get_logger
+
+log = get_logger("mt5_simulator")
+
+SymbolInfo = namedtuple(
+    "SymbolInfo",
+    "name description path digits point spread trade_tick_size trade_contract_size trade_tick_value "
+    "volume_min volume_max volume_step trade_stops_level trade_freeze_level trade_mode "
+    "currency_profit visible bid ask",
+)
+Tick = namedtuple("Tick", "time bid ask last volume time_msc flags volume_real")
+AccountInfo = namedtuple(
+    "AccountInfo", "login name server currency leverage balance equity profit margin margin_free"
+)
+TradeOrder = namedtuple(
+    "TradeOrder",
+    "ticket time_setup time_setup_msc type type_time type_filling time_expiration magic "
+    "volume_initial volume_current price_open sl tp price_current symbol comment",
+)
+OrderSendResult = namedtuple(
+    "OrderSendResult", "retcode deal order volume price bid ask comment request_id retcode_external request"
+)
+
+# Forex currencies and CFDs of the synthetic catalog: name -> (digits, price, contract size)
+CURRENCIES = ["USD", "EUR", "GBP", "JPY", "AUD", "NZD", "CAD", "CHF", "SGD", "HKD"]
+CFDS = {
+    "XAUUSD": (2, 2350.0, 100),
+    "XAGUSD": (3, 30.5, 5000),
+    "DE40": (1, 18400.0, 1),
+    "US500": (1, 5300.0, 1),
+    "USTEC": (1, 18500.0, 1),
+    "US30": (1, 39500.0, 1),
+    "BTCUSD": (2, 61000.0, 1),
+    "ETHUSD": (2, 3100.0, 1),
+}
+
+RETCODE_COMMENTS = {
+    10004: "Requote",
+    10006: "Request rejected",
+    10009: "Request executed",
+    10013: "Invalid request",
+    10014: "Invalid volume",
+    10015: "Invalid price",
+    10016: "Invalid stops",
+    10017: "Trade disabled",
+    10018: "Market closed",
+    10020: "Prices changed",
+    10021: "No quotes to process request",
+    10024: "Too frequent requests",
+    10027: "AutoTrading disabled by client",
+    10031: "No connection with the trade server",
+}
+
+
+def make_symbol(name, digits, price, contract_size, description="", stops_level=10, trade_mode=4):
+    """Static symbol record; the spread is ten points and stops/freeze levels are in points."""
+    point = 10**-digits
+    return SymbolInfo(
+        name, description or name, "", digits, point, 10, point, contract_size, point * contract_size,
+        0.01, 100.0, 0.01, stops_level, 0, trade_mode, "USD", True, price, price + 10 * point,
+    )
+
+
+def build_catalog(size, seed=7, suffix=".r"):
+    """Synthetic catalog: forex and CFDs with a broker suffix, padded with stocks."""
+    rng = random.Random(seed)
+    catalog = {}
+    for base in CURRENCIES:
+        for quote in CURRENCIES:
+            if base != quote:
+                digits, price = (3, 150.0) if quote == "JPY" else (5, 1.1)
+                catalog[base + quote + suffix] = make_symbol(base + quote + suffix, digits, price, 100000)
+    for name, (digits, price, contract_size) in CFDS.items():
+        catalog[name + suffix] = make_symbol(name + suffix, digits, price, contract_size)
+    catalog["AAPL.NAS"] = make_symbol("AAPL.NAS", 2, 190.0, 1, "Apple Inc")
+    catalog["MSFT.NAS"] = make_symbol("MSFT.NAS", 2, 420.0, 1, "Microsoft Corporation")
+
+    while len(catalog) < size:
+        ticker = "".join(rng.choices(string.ascii_uppercase, k=rng.randint(2, 5)))
+        name = ticker + rng.choice([".NYSE", ".NAS"])
+        words = " ".join(
+            "".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 9))).title() for _ in range(2)
+        )
+        catalog.setdefault(name, make_symbol(name, 2, round(rng.uniform(5, 500), 2), 1, f"{words} Inc"))
+    return list(catalog.values())[:size]
+
+
+class MT5Simulator:
+    """
+    Simulated terminal session. An instance is used in place of the MetaTrader5
+    module: it has the same constants and the same call signatures.
+    """
+
+    TRADE_ACTION_DEAL = 1
+    TRADE_ACTION_PENDING = 5
+    TRADE_ACTION_SLTP = 6
+    TRADE_ACTION_MODIFY = 7
+    TRADE_ACTION_REMOVE = 8
+
+    ORDER_TYPE_BUY = 0
+    ORDER_TYPE_SELL = 1
+    ORDER_TYPE_BUY_LIMIT = 2
+    ORDER_TYPE_SELL_LIMIT = 3
+    ORDER_TYPE_BUY_STOP = 4
+    ORDER_TYPE_SELL_STOP = 5
+
+    ORDER_TIME_GTC = 0
+    ORDER_TIME_DAY = 1
+    ORDER_TIME_SPECIFIED = 2
+    ORDER_TIME_SPECIFIED_DAY = 3
+
+    ORDER_FILLING_FOK = 0
+    ORDER_FILLING_IOC = 1
+    ORDER_FILLING_RETURN = 2
+
+    SYMBOL_TRADE_MODE_DISABLED = 0
+    SYMBOL_TRADE_MODE_LONGONLY = 1
+    SYMBOL_TRADE_MODE_SHORTONLY = 2
+    SYMBOL_TRADE_MODE_CLOSEONLY = 3
+    SYMBOL_TRADE_MODE_FULL = 4
+
+    TRADE_RETCODE_REQUOTE = 10004
+    TRADE_RETCODE_REJECT = 10006
+    TRADE_RETCODE_PLACED = 10008
+    TRADE_RETCODE_DONE = 10009
+    TRADE_RETCODE_INVALID = 10013
+    TRADE_RETCODE_INVALID_VOLUME = 10014
+    TRADE_RETCODE_INVALID_PRICE = 10015
+    TRADE_RETCODE_INVALID_STOPS = 10016
+    TRADE_RETCODE_TRADE_DISABLED = 10017
+    TRADE_RETCODE_MARKET_CLOSED = 10018
+    TRADE_RETCODE_PRICE_CHANGED = 10020
+    TRADE_RETCODE_PRICE_OFF = 10021
+    TRADE_RETCODE_TOO_MANY_REQUESTS = 10024
+    TRADE_RETCODE_CLIENT_DISABLES_AT = 10027
+    TRADE_RETCODE_CONNECTION = 10031
+
+    RES_S_OK = 1
+    RES_E_FAIL = -1
+    RES_E_INVALID_PARAMS = -2
+    RES_E_NOT_FOUND = -4
+    RES_E_INTERNAL_FAIL = -10001
+
+    def __init__(
+        self,
+        catalog=None,
+        catalog_size=1000,
+        seed=7,
+        balance=10000.0,
+        currency="USD",
+        latency=None,
+        reject_rate=0.0,
+        reject_retcodes=(10004,),
+        validate=True,
+        volatility=0.0002,
+    ):
+        # latency: call name -> seconds, or [low, high] for a uniform random delay
+        self.latency = dict(latency or {})
+        self.reject_rate = reject_rate
+        self.reject_retcodes = list(reject_retcodes)
+        self.validate = validate
+        self.volatility = volatility  # relative standard deviation per sqrt(second)
+
+        self._lock = threading.RLock()
+        self._rng = random.Random(seed)
+        self._scripted = deque()  # retcodes returned by the next order_send calls
+        self._last_error = (self.RES_S_OK, "Success")
+        self._connected = False
+        self._account = {"login": 0, "server": "Simulator", "balance": float(balance), "currency": currency}
+        self._orders = {}  # ticket -> TradeOrder
+        self._next_ticket = 1
+        self._quotes = {}  # symbol -> (mid, monotonic time of the last step)
+        self.calls = {}  # call name -> count
+        self.set_catalog(catalog if catalog is not None else catalog_size)
+
+    # Configuration
+
+    def set_catalog(self, catalog):
+        """Replace the catalog with SymbolInfo records or a synthetic catalog of that size."""
+        if isinstance(catalog, int):
+            catalog = build_catalog(catalog)
+        with self._lock:
+            self._catalog = tuple(catalog)
+            self._by_name = {symbol.name: symbol for symbol in self._catalog}
+            self._quotes = {name: quote for name, quote in self._quotes.items() if name in self._by_name}
+
+    def fail_next(self, retcode, count=1):
+        """Make the next count order_send calls return retcode."""
+        with self._lock:
+            self._scripted.extend([retcode] * count)
+
+    @property
+    def orders_placed(self):
+        return self._next_ticket - 1
+
+    def _enter(self, name):
+        """Count the call and apply its injected latency."""
+        with self._lock:
+            self.calls[name] = self.calls.get(name, 0) + 1
+        delay = self.latency.get(name)
+        if isinstance(delay, (list, tuple)):
+            delay = self._rng.uniform(*delay)
+        if delay:
+            time.sleep(delay)
+
+    def _fail(self, code, message):
+        self._last_error = (code, message)
+        return None
+
+    # Session
+
+    def initialize(self, path=None, login=None, password=None, server=None, timeout=None, portable=False):
+        self._enter("initialize")
+        with self._lock:
+            if login is not None:
+                self._account["login"] = int(login)
+            if server is not None:
+                self._account["server"] = server
+            self._connected = True
+            self._last_error = (self.RES_S_OK, "Success")
+        log.info(f"Simulated terminal initialized with {len(self._catalog)} symbols")
+        return True
+
+    def shutdown(self):
+        self._enter("shutdown")
+        self._connected = False
+        return True
+
+    def last_error(self):
+        return self._last_error
+
+    # Market data
+
+    def symbols_total(self):
+        return len(self._catalog)
+
+    def symbols_get(self, group=None):
+        self._enter("symbols_get")
+        if not self._connected:
+            return self._fail(self.RES_E_INTERNAL_FAIL, "Terminal: Not initialized")
+        return self._catalog
+
+    def _quote(self, name):
+        """Advance the symbol's random walk to now and return (bid, ask)."""
+        info = self._by_name[name]
+        now = time.monotonic()
+        with self._lock:
+            mid, stepped = self._quotes.get(name, (info.bid, now))
+            elapsed = now - stepped
+            if elapsed > 0:
+                mid *= math.exp(self._rng.gauss(0.0, self.volatility * math.sqrt(elapsed)))
+            self._quotes[name] = (mid, now)
+        bid = round(mid, info.digits)
+        return bid, round(bid + info.spread * info.point, info.digits)
+
+    def symbol_info(self, symbol):
+        self._enter("symbol_info")
+        info = self._by_name.get(symbol)
+        if info is None:
+            return self._fail(self.RES_E_NOT_FOUND, f"Symbol {symbol} not found")
+        bid, ask = self._quote(symbol)
+        return info._replace(bid=bid, ask=ask)
+
+    def symbol_info_tick(self, symbol):
+        self._enter("symbol_info_tick")
+        if symbol not in self._by_name:
+            return self._fail(self.RES_E_NOT_FOUND, f"Symbol {symbol} not found")
+        bid, ask = self._quote(symbol)
+        now = time.time()
+        return Tick(int(now), bid, ask, 0.0, 0, int(now * 1000), 6, 0.0)
+
+    def account_info(self):
+        self._enter("account_info")
+        if not self._connected:
+            return self._fail(self.RES_E_INTERNAL_FAIL, "Terminal: Not initialized")
+        with self._lock:
+            account = dict(self._account)
+        # Pending orders hold no margin and nothing ever fills, so equity stays at the balance
+        return AccountInfo(
+            account["login"], "Simulated account", account["server"], account["currency"], 100,
+            account["balance"], account["balance"], 0.0, 0.0, account["balance"],
+        )
+
+    # Orders
+
+    def orders_total(self):
+        return len(self._orders)
+
+    def orders_get(self, symbol=None, group=None, ticket=None):
+        self._enter("orders_get")
+        with self._lock:
+            orders = list(self._orders.values())
+        if ticket is not None:
+            orders = [order for order in orders if order.ticket == ticket]
+        if symbol is not None:
+            orders = [order for order in orders if order.symbol == symbol]
+        return tuple(orders)
+
+    def positions_get(self, symbol=None, group=None, ticket=None):
+        # Pending orders are never filled here, so there are no positions
+        self._enter("positions_get")
+        return ()
+
+    def _result(self, retcode, request, order=0, price=0.0, bid=0.0, ask=0.0):
+        return OrderSendResult(
+            retcode, 0, order, request.get("volume", 0.0), price, bid, ask,
+            RETCODE_COMMENTS.get(retcode, ""), 0, 0, request,
+        )
+
+    def _check(self, request, info, bid, ask):
+        """Broker-side checks a real server applies; returns a retcode or None."""
+        volume = request.get("volume", 0.0)
+        steps = (volume - info.volume_min) / info.volume_step
+        if volume < info.volume_min or volume > info.volume_max or abs(steps - round(steps)) > 1e-6:
+            return self.TRADE_RETCODE_INVALID_VOLUME
+
+        kind = request.get("type")
+        if info.trade_mode == self.SYMBOL_TRADE_MODE_DISABLED:
+            return self.TRADE_RETCODE_TRADE_DISABLED
+        if info.trade_mode == self.SYMBOL_TRADE_MODE_LONGONLY and kind % 2 == 1:
+            return self.TRADE_RETCODE_TRADE_DISABLED
+        if info.trade_mode == self.SYMBOL_TRADE_MODE_SHORTONLY and kind % 2 == 0:
+            return self.TRADE_RETCODE_TRADE_DISABLED
+
+        price = request.get("price", 0.0)
+        if kind == self.ORDER_TYPE_BUY_LIMIT and price >= ask:
+            return self.TRADE_RETCODE_INVALID_PRICE
+        if kind == self.ORDER_TYPE_SELL_LIMIT and price <= bid:
+            return self.TRADE_RETCODE_INVALID_PRICE
+
+        # SL/TP must sit at least stops_level points away from the open price, on the right side
+        min_distance = info.trade_stops_level * info.point
+        sl, tp = request.get("sl", 0.0), request.get("tp", 0.0)
+        buy = kind % 2 == 0
+        if sl and (price - sl if buy else sl - price) < min_distance:
+            return self.TRADE_RETCODE_INVALID_STOPS
+        if tp and (tp - price if buy else price - tp) < min_distance:
+            return self.TRADE_RETCODE_INVALID_STOPS
+        return None
+
+    def order_send(self, request):
+        self._enter("order_send")
+        if not self._connected:
+            return self._fail(self.RES_E_INTERNAL_FAIL, "Terminal: Not initialized")
+        info = self._by_name.get(request.get("symbol"))
+        if info is None:
+            return self._result(self.TRADE_RETCODE_INVALID, request)
+        bid, ask = self._quote(info.name)
+
+        with self._lock:
+            retcode = self._scripted.popleft() if self._scripted else None
+        if retcode is None and self.reject_rate and self._rng.random() < self.reject_rate:
+            retcode = self._rng.choice(self.reject_retcodes)
+        if retcode is None and self.validate:
+            retcode = self._check(request, info, bid, ask)
+        if retcode is not None and retcode != self.TRADE_RETCODE_DONE:
+            return self._result(retcode, request, bid=bid, ask=ask)
+
+        action = request.get("action")
+        if action == self.TRADE_ACTION_REMOVE:
+            with self._lock:
+                removed = self._orders.pop(request.get("order"), None)
+            retcode = self.TRADE_RETCODE_DONE if removed else self.TRADE_RETCODE_INVALID
+            return self._result(retcode, request, order=request.get("order", 0))
+
+        with self._lock:
+            ticket = self._next_ticket
+            self._next_ticket += 1
+            if action == self.TRADE_ACTION_PENDING:
+                now = time.time()
+                self._orders[ticket] = TradeOrder(
+                    ticket, int(now), int(now * 1000), request["type"], request.get("type_time", 0),
+                    request.get("type_filling", 0), request.get("expiration", 0), request.get("magic", 0),
+                    request["volume"], request["volume"], request["price"], request.get("sl", 0.0),
+                    request.get("tp", 0.0), bid if request["type"] % 2 else ask, info.name,
+                    request.get("comment") or "",
+                )
+        price = request.get("price", 0.0) if action == self.TRADE_ACTION_PENDING else (
+            ask if request.get("type") == self.ORDER_TYPE_BUY else bid
+        )
+        return self._result(self.TRADE_RETCODE_DONE, request, order=ticket, price=price, bid=bid, ask=ask)
@@ -0,0 +1,108 @@
+"""
+Classification of order_send retcodes and the backoff schedule for resends.
+
+Requotes, price changes, throttling and a lost server connection are
+transient: the same order usually goes through when sent again shortly
+after. Everything else (invalid stops, no money, autotrading disabled...) is
+final and is reported at once. Resends back off exponentially with jitter
+and stop at the attempt limit or the signal's deadline, whichever is first.
+"""
+
+import random
+import time
+
+# Trade server return codes (MqlTradeResult.retcode)
+RETCODE_NAMES = {
+    10004: "requote",
+    10006: "request rejected",
+    10007: "request canceled by trader",
+    10008: "order placed",
+    10009: "request completed",
+    10010: "only part of the request was completed",
+    10011: "request processing error",
+    10012: "request canceled by timeout",
+    10013: "invalid request",
+    10014: "invalid volume",
+    10015: "invalid price",
+    10016: "invalid stops",
+    10017: "trade is disabled",
+    10018: "market is closed",
+    10019: "not enough money",
+    10020: "prices changed",
+    10021: "no quotes to process the request",
+    10022: "invalid order expiration",
+    10023: "order state changed",
+    10024: "too many requests",
+    10025: "no changes in request",
+    10026: "autotrading disabled by server",
+    10027: "autotrading disabled in the terminal",
+    10028: "request locked for processing",
+    10029: "order or position frozen",
+    10030: "invalid order filling type",
+    10031: "no connection with the trade server",
+    10032: "operation allowed only for live accounts",
+    10033: "pending order limit reached",
+    10034: "order and position volume limit reached",
+    10035: "incorrect or prohibited order type",
+    10036: "position already closed",
+}
+
+# Transient conditions a resend can get past. A missing result (None) is not
+# retried: the request may have reached the server before the terminal failed.
+RETRYABLE_RETCODES = frozenset({10004, 10012, 10020, 10021, 10024, 10031})
+
+
+def is_retryable(retcode):
+    return retcode in RETRYABLE_RETCODES
+
+
+def describe_retcode(retcode):
+    if retcode is None:
+        return "no result from terminal"
+    return RETCODE_NAMES.get(retcode, f"retcode {retcode}")
+
+
+class RetryPolicy:
+    """Jittered exponential backoff bounded by an attempt count and a deadline."""
+
+    def __init__(self, max_attempts=3, base_delay=0.05, max_delay=0.5, deadline=3.0):
+        self.max_attempts = max(1, int(max_attempts))
+        self.base_delay = float(base_delay)
+        self.max_delay = float(max_delay)
+        self.deadline = float(deadline)
+
+    @classmethod
+    def from_settings(cls, settings):
+        """Build from the retry_* entries of settings.json."""
+        return cls(
+            settings.get("retry_max_attempts", 3),
+            settings.get("retry_base_delay", 0.05),
+            settings.get("retry_max_delay", 0.5),
+            settings.get("retry_deadline", 3.0),
+        )
+
+    def as_dict(self):
+        return {
+            "max_attempts": self.max_attempts,
+            "base_delay": self.base_delay,
+            "max_delay": self.max_delay,
+            "deadline": self.deadline,
+        }
+
+    def start(self):
+        """Monotonic deadline for a signal whose orders start now."""
+        return time.monotonic() + self.deadline
+
+    def next_delay(self, attempts, deadline):
+        """
+        Seconds to wait before attempt number attempts + 1, or None when the
+        attempts are used up or the wait would run past the deadline.
+        """
+        if attempts >= self.max_attempts:
+            return None
+        # Half fixed, half random, so resends of a burst do not line up
+        cap = min(self.max_delay, self.base_delay * 2 ** (attempts - 1))
+        delay = cap / 2 + random.uniform(0, cap / 2)
+        if time.monotonic() + delay > deadline:
+            return None
+        return delay
@@ -0,0 +1,106 @@
+"""
+Local pre-validation of order requests against cached broker constraints.
+
+Checks what the trade server would reject anyway (trade mode, volume
+limits and step, limit price on the wrong side of the market or inside the
+stops level, SL/TP too close) using the cached symbol spec and the latest
+quote, so a bad limit fails in microseconds instead of after an order_send
+round trip.
+"""
+
+# MT5 ENUM_SYMBOL_TRADE_MODE values
+TRADE_MODE_DISABLED = 0
+TRADE_MODE_LONGONLY = 1
+TRADE_MODE_SHORTONLY = 2
+TRADE_MODE_CLOSEONLY = 3
+
+# MT5 ENUM_ORDER_TYPE values: buy types are even, sell types odd
+ORDER_TYPE_BUY_LIMIT = 2
+ORDER_TYPE_SELL_LIMIT = 3
+ORDER_TYPE_BUY_STOP = 4
+ORDER_TYPE_SELL_STOP = 5
+
+
+def check_trade_mode(spec, is_buy):
+    """Return (code, reason) if the symbol does not accept new orders on this side, else None."""
+    mode = spec.trade_mode
+    if mode == TRADE_MODE_DISABLED:
+        return "trade_mode", "trading is disabled for this symbol"
+    if mode == TRADE_MODE_CLOSEONLY:
+        return "trade_mode", "symbol is close-only"
+    if mode == TRADE_MODE_LONGONLY and not is_buy:
+        return "trade_mode", "symbol is long-only"
+    if mode == TRADE_MODE_SHORTONLY and is_buy:
+        return "trade_mode", "symbol is short-only"
+    return None
+
+
+def check_volume(volume, spec):
+    """Return (code, reason) if the volume is outside min/max or off the volume step, else None."""
+    if volume < spec.volume_min:
+        return "volume", f"volume {volume} below minimum {spec.volume_min}"
+    if volume > spec.volume_max:
+        return "volume", f"volume {volume} above maximum {spec.volume_max}"
+    steps = (volume - spec.volume_min) / spec.volume_step
+    if abs(steps - round(steps)) > 1e-6:
+        return "volume", f"volume {volume} is not a multiple of step {spec.volume_step}"
+    return None
+
+
+def check_prices(request, spec, tick=None):
+    """
+    Return (code, reason) if the entry, SL or TP would be rejected, else None.
+
+    SL and TP distances from the entry use the stops level only. The entry's
+    distance from the market also respects the freeze level: inside it a
+    pending order could not be modified or cancelled once placed. Checks
+    against the market are skipped when no quote is available.
+    """
+    order_type = request["type"]
+    is_buy = order_type % 2 == 0
+    price = request["price"]
+    point = spec.point
+    stops_distance = spec.trade_stops_level * point
+
+    if tick is not None and order_type in (ORDER_TYPE_BUY_LIMIT, ORDER_TYPE_SELL_LIMIT):
+        if order_type == ORDER_TYPE_BUY_LIMIT:
+            if price >= tick.ask:
+                return "price_side", f"buy limit {price} is not below ask {tick.ask}"
+            distance = tick.ask - price
+        else:
+            if price <= tick.bid:
+                return "price_side", f"sell limit {price} is not above bid {tick.bid}"
+            distance = price - tick.bid
+        min_distance = max(spec.trade_stops_level, spec.trade_freeze_level) * point
+        if distance < min_distance - point / 2:
+            return "price_distance", f"limit {price} is within {min_distance} of the market"
+
+    sl = request.get("sl")
+    if sl:
+        distance = price - sl if is_buy else sl - price
+        if distance <= 0:
+            return "stops", f"SL {sl} is on the wrong side of entry {price}"
+        if distance < stops_distance - point / 2:
+            return "stops", f"SL {sl} is within the stops level of entry {price}"
+
+    tp = request.get("tp")
+    if tp:
+        distance = tp - price if is_buy else price - tp
+        if distance <= 0:
+            return "stops", f"TP {tp} is on the wrong side of entry {price}"
+        if distance < stops_distance - point / 2:
+            return "stops", f"TP {tp} is within the stops level of entry {price}"
+    return None
+
+
+def validate_order_request(request, spec, tick=None, check_volume_limits=True):
+    """
+    Run every local check on a built order request.
+    Returns None if it looks acceptable, otherwise (code, reason) of the first failure.
+    """
+    problem = check_trade_mode(spec, request["type"] % 2 == 0)
+    if problem is None and check_volume_limits:
+        problem = check_volume(request["volume"], spec)
+    if problem is None:
+        problem = check_prices(request, spec, tick)
+    return problem
@@ -0,0 +1,105 @@
+"""
+Live quote cache kept up to date by a background tick poller.
+
+The poller refreshes a bounded set of watched symbols (pinned symbols plus the
+most recently signalled ones). Reads older than max_age fall back to a direct
+fetch so a stalled poller never feeds stale prices into an order.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from bot_logging import get_logger
+
+log = get_logger("quote_cache")
+
+
+class QuoteCache:
+    """Thread-safe cache of the latest tick per symbol."""
+
+    def __init__(self, fetch_tick, poll_interval=0.5, watch_size=32, max_age=2.0):
+        # fetch_tick(symbol) returns an object with bid/ask (mt5.symbol_info_tick) or None
+        self.fetch_tick = fetch_tick
+        self.poll_interval = poll_interval
+        self.watch_size = watch_size
+        self.max_age = max_age
+
+        self._lock = threading.Lock()
+        self._quotes = {}  # symbol -> (tick, monotonic receive time)
+        self._pinned = []
+        self._recent = OrderedDict()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def pin(self, symbols):
+        """Always watch these symbols (e.g. the SYMBOL_MAPPINGS targets)."""
+        with self._lock:
+            self._pinned = [symbol for symbol in dict.fromkeys(symbols) if symbol]
+
+    def touch(self, symbol):
+        """Mark a symbol as recently signalled so the poller keeps it warm."""
+        with self._lock:
+            self._recent[symbol] = None
+            self._recent.move_to_end(symbol)
+            while len(self._recent) > self.watch_size:
+                self._recent.popitem(last=False)
+
+    def watched(self):
+        """Return the symbols the poller refreshes, capped at watch_size."""
+        with self._lock:
+            symbols = list(dict.fromkeys(self._pinned + list(reversed(self._recent))))
+        return symbols[: self.watch_size]
+
+    def get(self, symbol):
+        """
+        Return the latest tick for a symbol. A cached quote older than max_age
+        is refreshed with a direct fetch before it is returned.
+        """
+        with self._lock:
+            cached = self._quotes.get(symbol)
+        if cached and time.monotonic() - cached[1] <= self.max_age:
+            return cached[0]
+        return self._fetch(symbol)
+
+    def fresh(self, symbol):
+        """Fetch a tick directly, ignoring any cached one (e.g. before resending a requoted order)."""
+        return self._fetch(symbol)
+
+    def age(self, symbol):
+        """Seconds since the cached quote was received, or None if not cached."""
+        with self._lock:
+            cached = self._quotes.get(symbol)
+        return time.monotonic() - cached[1] if cached else None
+
+    def _fetch(self, symbol):
+        tick = self.fetch_tick(symbol)
+        if tick:
+            with self._lock:
+                self._quotes[symbol] = (tick, time.monotonic())
+        return tick
+
+    def poll_once(self):
+        """Refresh every watched symbol once."""
+        for symbol in self.watched():
+            try:
+                self._fetch(symbol)
+            except Exception as e:
+                log.warning(f"Error polling quote for {symbol}: {str(e)}")
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="quote-poller", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.poll_interval * 2 + 1)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.poll_once()
+            self._stop.wait(self.poll_interval)
@@ -0,0 +1,152 @@
+"""
+Outbound Discord replies, queued per channel and sent off the trading path.
+
+Handlers post a reply and move on; one sender task per channel delivers it.
+Each channel is its own Discord rate-limit route and gets a token bucket.
+Replies that pile up while the sender waits for a token go out merged into
+one message, split only at Discord's length limit. A rate-limit backoff
+inside discord.py then holds up that channel's sender, never order placement.
+"""
+
+import asyncio
+import contextvars
+import time
+from collections import deque
+
+from bot_logging import get_logger
+
+log = get_logger("reply_queue")
+
+# Discord rejects messages longer than this
+MAX_MESSAGE_LENGTH = 2000
+
+
+class TokenBucket:
+    """Allows rate sends per second on average and bursts of up to burst sends."""
+
+    def __init__(self, rate=1.0, burst=5):
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        """Wait until a send is allowed and take it."""
+        self._refill()
+        while self.tokens < 1:
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+            self._refill()
+        self.tokens -= 1
+
+
+def split_reply(text, limit=MAX_MESSAGE_LENGTH):
+    """Split one reply into pieces of at most limit characters, at line breaks where possible."""
+    pieces = []
+    while len(text) > limit:
+        cut = text.rfind("\n", 0, limit)
+        if cut <= 0:
+            cut = limit
+        pieces.append(text[:cut])
+        text = text[cut:].lstrip("\n")
+    pieces.append(text)
+    return pieces
+
+
+def merge_replies(replies, limit=MAX_MESSAGE_LENGTH):
+    """Join replies, one per line, into as few messages as fit the length limit."""
+    messages = []
+    for reply in replies:
+        for piece in split_reply(reply, limit):
+            if messages and len(messages[-1]) + 1 + len(piece) <= limit:
+                messages[-1] += "\n" + piece
+            else:
+                messages.append(piece)
+    return messages
+
+
+class _Route:
+    __slots__ = ("pending", "bucket", "task")
+
+    def __init__(self, bucket):
+        self.pending = deque()  # (text, perf_counter time posted)
+        self.bucket = bucket
+        self.task = None
+
+
+class ReplyQueue:
+    """Per-channel reply queues, each drained by its own sender task."""
+
+    def __init__(self, rate=1.0, burst=5, metrics=None):
+        self.rate = rate
+        self.burst = burst
+        self.metrics = metrics
+        self._routes = {}  # channel -> _Route
+        self._loop = None
+
+    def _route(self, channel):
+        # Sender tasks belong to one event loop; replays and benchmarks run several
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop, self._routes = loop, {}
+        route = self._routes.get(channel)
+        if route is None:
+            route = self._routes[channel] = _Route(TokenBucket(self.rate, self.burst))
+        return route
+
+    def post(self, channel, text):
+        """Queue a reply for channel and return at once; must be called from the event loop."""
+        route = self._route(channel)
+        route.pending.append((str(text), time.perf_counter()))
+        if route.task is None or route.task.done():
+            # Fresh context: the sender's log lines should not carry the posting signal's id
+            route.task = self._loop.create_task(
+                self._drain(channel, route), context=contextvars.Context()
+            )
+
+    async def _drain(self, channel, route):
+        while route.pending:
+            await route.bucket.acquire()
+
+            # Everything queued while waiting for the token goes out together
+            batch = list(route.pending)
+            route.pending.clear()
+            messages = merge_replies([text for text, _ in batch])
+            oldest = batch[0][1]
+            if len(messages) > 1:
+                # Over the length limit: the remainder waits for the next token
+                route.pending.extendleft((text, oldest) for text in reversed(messages[1:]))
+
+            started = time.perf_counter()
+            try:
+                await channel.send(messages[0])
+            except Exception as e:
+                log.error(f"Failed to send reply to {_channel_name(channel)}: {str(e)}")
+            if self.metrics:
+                self.metrics.observe("reply_send", time.perf_counter() - started)
+                self.metrics.observe("reply_wait", started - oldest)
+                self.metrics.increment("replies", "merged" if len(batch) > 1 else "single")
+
+    async def flush(self):
+        """Wait until every queued reply has been sent."""
+        while True:
+            tasks = [route.task for route in self._routes.values() if route.task and not route.task.done()]
+            if not tasks:
+                return
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def depths(self):
+        """Replies waiting per channel."""
+        return {
+            _channel_name(channel): len(route.pending)
+            for channel, route in list(self._routes.items())
+            if route.pending
+        }
+
+
+def _channel_name(channel):
+    return str(getattr(channel, "name", None) or getattr(channel, "id", None) or id(channel))
@@ -0,0 +1,126 @@
+"""
+Compiled, read-only view of the risk configuration used on the signal path.
+
+settings.json (risk_config) stays the editable source of truth. Whenever a
+command changes it, it is compiled into a new RiskSnapshot: per configuration
+one array of lots and one of risk percentages per ladder length, the take
+profit table with zeros dropped, and the scalar settings resolved with their
+defaults. main.py swaps the module-level snapshot in one assignment, so a
+signal that picked up a snapshot sizes its whole ladder from the same view
+even if a command lands halfway through.
+"""
+
+from types import MappingProxyType
+
+import numpy as np
+
+from lot_sizing import split_ladder
+
+
+def _frozen(values):
+    array = np.array(values, dtype=np.float64)
+    array.flags.writeable = False
+    return array
+
+
+class LadderTable:
+    """Per-limit values (lots or risk %) for every ladder length of one configuration."""
+
+    __slots__ = ("rows", "total")
+
+    def __init__(self, profiles, default, max_limits):
+        # rows[n] holds the values of an n-limit ladder; lengths without a profile get the default
+        rows = [_frozen([])]
+        for num_limits in range(1, max_limits + 1):
+            configured = profiles.get(str(num_limits))
+            if configured is None:
+                configured = [default] * num_limits
+            rows.append(_frozen(configured))
+        self.rows = tuple(rows)
+
+        # Longer ladders split the total of the largest configured profile
+        sizes = [int(key) for key in profiles if str(key).isdigit() and profiles[key]]
+        self.total = float(sum(profiles[str(max(sizes))])) if sizes else None
+
+    def values(self, num_limits, rule):
+        """Array of num_limits values; never modify it, it is shared by every signal."""
+        if num_limits < len(self.rows):
+            return self.rows[num_limits]
+        if self.total is None:
+            return self.rows[0]
+        return split_ladder(self.total, num_limits, rule)
+
+
+class SizingTables:
+    """Compiled fixed-lot and risk-percentage tables of one named configuration."""
+
+    __slots__ = ("fixed_lots", "risk_percentages")
+
+    def __init__(self, fixed_lots, risk_percentages):
+        self.fixed_lots = fixed_lots
+        self.risk_percentages = risk_percentages
+
+
+class RiskSnapshot:
+    """Everything signal handling reads from risk_config, resolved once."""
+
+    __slots__ = (
+        "active_config",
+        "mode",
+        "ladder_rule",
+        "sizing_basis",
+        "autospread",
+        "tables",
+        "tp_values",
+    )
+
+    def __init__(self, active_config, mode, ladder_rule, sizing_basis, autospread, tables, tp_values):
+        self.active_config = active_config
+        self.mode = mode
+        self.ladder_rule = ladder_rule
+        self.sizing_basis = sizing_basis
+        self.autospread = autospread
+        self.tables = tables  # configuration name -> SizingTables
+        self.tp_values = tp_values  # TP category -> pips (forex) or price distance, only non-zero ones
+
+    def sizing_tables(self, config_name=None):
+        """
+        Tables of the named configuration (the active one by default).
+        Returns (tables, found); unknown names fall back to "default".
+        """
+        tables = self.tables.get(config_name or self.active_config)
+        if tables is not None:
+            return tables, True
+        return self.tables["default"], False
+
+
+def compile_risk_config(risk_config, default_fixed_lots, default_risk_percentages, max_limits):
+    """Build a RiskSnapshot from the settings.json risk configuration."""
+    configs = dict(risk_config.get("configs") or {})
+    if "default" not in configs:
+        configs["default"] = {"fixed_lots": default_fixed_lots, "risk_percentages": default_risk_percentages}
+
+    tables = {
+        name: SizingTables(
+            LadderTable(config.get("fixed_lots", default_fixed_lots), 0.1, max_limits),
+            LadderTable(config.get("risk_percentages", default_risk_percentages), 1.0, max_limits),
+        )
+        for name, config in configs.items()
+    }
+
+    tp_pips = risk_config.get("tp_pips")
+    tp_values = {
+        category: float(value)
+        for category, value in (tp_pips.items() if isinstance(tp_pips, dict) else ())
+        if float(value)
+    }
+
+    return RiskSnapshot(
+        active_config=risk_config.get("active_config", "default"),
+        mode=risk_config.get("mode", "risk"),
+        ladder_rule=risk_config.get("ladder_rule", "equal"),
+        sizing_basis=risk_config.get("sizing_basis", "balance"),
+        autospread=bool(risk_config.get("autospread", False)),
+        tables=MappingProxyType(tables),
+        tp_values=MappingProxyType(tp_values),
+    )
@@ -0,0 +1,103 @@
+"""
+Debounced, atomic write-behind persistence for settings.json.
+
+Rapid config changes are coalesced into one write after a short quiet period.
+Writes run on a timer thread, go to a temp file that is fsynced and then
+renamed over the target, so a crash never leaves a half-written file.
+"""
+
+import json
+import os
+import threading
+import time
+
+from bot_logging import get_logger
+
+log = get_logger("settings")
+
+
+def write_json_atomic(path, data):
+    """Write data as JSON to path via a fsynced temp file and an atomic rename."""
+    text = data if isinstance(data, str) else json.dumps(data, indent=4)
+    write_text_atomic(path, text)
+
+
+def write_text_atomic(path, text):
+    directory = os.path.dirname(os.path.abspath(path))
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+    # Persist the rename itself where the platform allows syncing a directory
+    if hasattr(os, "O_DIRECTORY"):
+        dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+class SettingsWriter:
+    """
+    Coalesces save requests into one atomic write.
+
+    schedule() snapshots the data on the caller's thread (so later mutations
+    cannot race the writer) and (re)arms a timer; the write happens once no
+    new change arrived for `debounce` seconds, or at most `max_delay` after
+    the first pending change.
+    """
+
+    def __init__(self, path, debounce=0.5, max_delay=5.0):
+        self.path = path
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.writes = 0
+
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()  # keeps writes in snapshot order
+        self._pending = None
+        self._first_pending_at = None
+        self._timer = None
+
+    def schedule(self, data):
+        """Queue a snapshot of data to be written after the debounce period."""
+        text = json.dumps(data, indent=4)
+        with self._lock:
+            self._pending = text
+            now = time.monotonic()
+            if self._first_pending_at is None:
+                self._first_pending_at = now
+            delay = min(self.debounce, max(0.0, self._first_pending_at + self.max_delay - now))
+
+            if self._timer:
+                self._timer.cancel()
+            self._timer = threading.Timer(delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        """Write the pending snapshot now, if there is one. Returns True on success."""
+        with self._write_lock:
+            with self._lock:
+                text, self._pending = self._pending, None
+                self._first_pending_at = None
+                if self._timer:
+                    self._timer.cancel()
+                    self._timer = None
+            if text is None:
+                return True
+
+            try:
+                write_text_atomic(self.path, text)
+                self.writes += 1
+                return True
+            except Exception as e:
+                log.error(f"Error saving risk configuration: {str(e)}")
+                return False
+
+    def close(self):
+        """Flush any pending change; call on shutdown."""
+        return self.flush()
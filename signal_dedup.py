@@ -0,0 +1,66 @@
+"""
+Idempotency layer for reposted and cross-posted signals.
+
+A parsed signal is reduced to a fingerprint (symbol, side, limit prices and
+stop loss, rounded to the symbol's digits). Fingerprints live in a bounded
+cache, evicted oldest first, with a time-to-live, so the same call posted
+again within the TTL is recognised before it is sized or sent.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+def signal_fingerprint(symbol, position, limits, stop_loss, digits=8):
+    """Normalized, hashable key of a parsed signal; the order of the limits does not matter."""
+    return (
+        symbol.upper(),
+        position.upper(),
+        tuple(sorted(round(float(limit), digits) for limit in limits)),
+        round(float(stop_loss), digits),
+    )
+
+
+class SignalDeduplicator:
+    """Recently seen fingerprints, at most max_entries, each kept for ttl seconds."""
+
+    def __init__(self, max_entries=1024, ttl=300.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._seen = OrderedDict()  # fingerprint -> monotonic time first seen
+        self._lock = threading.Lock()
+
+    def check(self, fingerprint):
+        """
+        Record a fingerprint. Returns None for a new signal, or the seconds
+        since the same signal was first seen if this is a duplicate.
+        """
+        if self.ttl <= 0:
+            return None
+
+        now = time.monotonic()
+        with self._lock:
+            # Entries are in insertion order, so expired ones sit at the front
+            while self._seen:
+                oldest, seen_at = next(iter(self._seen.items()))
+                if now - seen_at <= self.ttl:
+                    break
+                del self._seen[oldest]
+
+            seen_at = self._seen.get(fingerprint)
+            if seen_at is not None:
+                return now - seen_at
+
+            self._seen[fingerprint] = now
+            while len(self._seen) > self.max_entries:
+                self._seen.popitem(last=False)
+        return None
+
+    def forget(self, fingerprint):
+        """Drop a fingerprint, e.g. when its signal failed and a repost should go through."""
+        with self._lock:
+            self._seen.pop(fingerprint, None)
+
+    def __len__(self):
+        return len(self._seen)
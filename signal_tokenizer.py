@@ -0,0 +1,88 @@
+"""
+Single-pass tokenizer for trade signals.
+
+The message is lower-cased once and one precompiled pattern extracts the
+position, every number, the comments marker and the expiry/HOT keywords in a
+single scan, with the same matching rules as the separate re.search calls it
+replaces.
+"""
+
+import re
+
+# Keywords are matched as substrings ("today" counts as "day"), as before.
+# Tokens do not overlap, so "vthot" yields vth only.
+_TOKEN_PATTERN = re.compile(
+    r"comments:|\b(?:long|short)\b|\d+\.?\d*|hot|vth|alien|day|week"
+)
+
+# Used only if lower-casing changed the message length (non-ASCII text)
+_COMMENTS_PATTERN = re.compile(r"Comments:(.*?)(?=$|\n)", re.IGNORECASE)
+
+_POSITIONS = {"long": "LONG", "short": "SHORT"}
+
+# Cheap pre-filter patterns, see looks_like_signal()
+_POSITION_PATTERN = re.compile(r"\b(?:long|short)\b")
+_NUMBER_PATTERN = re.compile(r"\d+\.?\d*")
+
+
+class SignalTokens:
+    """Raw tokens of a signal message, before symbol resolution."""
+
+    __slots__ = ("position", "numbers", "comments", "keywords")
+
+    def __init__(self):
+        self.position = None
+        self.numbers = []
+        self.comments = ""
+        self.keywords = set()
+
+
+def tokenize_signal(message):
+    """
+    Scan a message once and return its SignalTokens.
+
+    position is the first standalone long/short (upper-cased), numbers are all
+    numbers in order, comments is the rest of the line after the first
+    "Comments:" and keywords holds any of hot/vth/alien/day/week.
+    """
+    tokens = SignalTokens()
+    lowered = message.lower()
+    has_comments = False
+
+    for token in _TOKEN_PATTERN.findall(lowered):
+        if token[0].isdigit():
+            tokens.numbers.append(token)
+        elif token in _POSITIONS:
+            if tokens.position is None:
+                tokens.position = _POSITIONS[token]
+        elif token == "comments:":
+            has_comments = True
+        else:
+            tokens.keywords.add(token)
+
+    if has_comments:
+        if len(lowered) == len(message):
+            start = lowered.index("comments:") + len("comments:")
+            end = message.find("\n", start)
+            tokens.comments = message[start : end if end != -1 else None].strip()
+        else:
+            comments_match = _COMMENTS_PATTERN.search(message)
+            if comments_match:
+                tokens.comments = comments_match.group(1).strip()
+
+    return tokens
+
+
+def looks_like_signal(message):
+    """
+    Cheap pre-filter: True if the message has a long/short token and at least
+    two numbers. Anything else is chatter and never needs a full parse.
+    """
+    lowered = message.lower()
+    if "long" not in lowered and "short" not in lowered:
+        return False
+    if not _POSITION_PATTERN.search(lowered):
+        return False
+
+    numbers = _NUMBER_PATTERN.finditer(message)
+    return next(numbers, None) is not None and next(numbers, None) is not None
@@ -0,0 +1,225 @@
+"""
+Precomputed symbol resolution index.
+
+Built once from the broker's symbol catalog so that resolving a token from a
+signal is a dict lookup instead of probing every suffix variant against the
+catalog on each message.
+"""
+
+import hashlib
+import json
+import os
+import re
+
+from bot_logging import get_logger
+
+log = get_logger("symbol_index")
+
+# Broker suffix variants, in order of preference (.r first, bare name last)
+BROKER_SUFFIXES = (".r", ".p", "m")
+
+# Words indexed from symbol descriptions
+_WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+class SymbolIndex:
+    """
+    Maps every base name, alias and broker-suffixed variant to the preferred
+    tradable symbol for the loaded catalog.
+    """
+
+    def __init__(self, symbols, mappings):
+        self.symbols = set(symbols)
+        self.mappings = dict(mappings)
+        self.tradable = {}
+        self.aliases = ()
+        self._build()
+
+    def _build(self):
+        # Rank of each candidate for a token: suffixes in preference order, then the bare name
+        ranks = {}
+        for symbol in self.symbols:
+            self._register(ranks, symbol, symbol, len(BROKER_SUFFIXES))
+            for rank, suffix in enumerate(BROKER_SUFFIXES):
+                if symbol.endswith(suffix) and len(symbol) > len(suffix):
+                    self._register(ranks, symbol[: -len(suffix)], symbol, rank)
+
+        # Aliases keep their declaration order, as the first alias found in the text wins
+        self.aliases = tuple(
+            (key, self.tradable.get(mapped_symbol))
+            for key, mapped_symbol in self.mappings.items()
+        )
+
+    def _register(self, ranks, token, symbol, rank):
+        if token not in ranks or rank < ranks[token]:
+            ranks[token] = rank
+            self.tradable[token] = symbol
+
+    def update(self, added, removed):
+        """
+        Apply a catalog diff. Only the tokens the added and removed symbols
+        resolve from are re-ranked, instead of rebuilding the whole index.
+        """
+        self.symbols.difference_update(removed)
+        self.symbols.update(added)
+
+        affected = set()
+        for symbol in (*added, *removed):
+            affected.add(symbol)
+            for suffix in BROKER_SUFFIXES:
+                if symbol.endswith(suffix) and len(symbol) > len(suffix):
+                    affected.add(symbol[: -len(suffix)])
+
+        for token in affected:
+            symbol = self._preferred(token)
+            if symbol is None:
+                self.tradable.pop(token, None)
+            else:
+                self.tradable[token] = symbol
+
+        self.aliases = tuple(
+            (key, self.tradable.get(mapped_symbol))
+            for key, mapped_symbol in self.mappings.items()
+        )
+
+    def _preferred(self, token):
+        """Best candidate for a token among the loaded symbols, same order as _build."""
+        for suffix in BROKER_SUFFIXES:
+            if token + suffix in self.symbols:
+                return token + suffix
+        return token if token in self.symbols else None
+
+    def resolve_token(self, token):
+        """Return the preferred tradable symbol for an upper-cased token, or None."""
+        return self.tradable.get(token)
+
+    def resolve_alias(self, text):
+        """
+        Return (matched, symbol) for the first alias contained in the lower-cased text.
+        symbol is None when the alias matched but its target is not tradable.
+        """
+        for key, symbol in self.aliases:
+            if key in text:
+                return True, symbol
+        return False, None
+
+    def __contains__(self, symbol):
+        return symbol in self.symbols
+
+    def __len__(self):
+        return len(self.symbols)
+
+
+def _catalog_key(symbols, descriptions):
+    """
+    Stable fingerprint of symbol names and their descriptions, used to
+    validate on-disk caches.
+    """
+    digest = hashlib.sha256()
+    for symbol in sorted(symbols):
+        digest.update(symbol.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update((descriptions.get(symbol) or "").encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class DescriptionIndex:
+    """
+    Inverted index (word -> set of symbols) over stock tickers and descriptions.
+
+    Built lazily on the first company-name lookup and persisted to cache_file,
+    keyed by the indexed names and their descriptions, so a restart against
+    the same catalog does not rebuild it and a renamed company does not keep
+    its old words.
+    """
+
+    def __init__(self, symbols, describe, cache_file=None):
+        # describe() returns {symbol: description}; called when the index is first needed
+        self.symbols = set(symbols)
+        self.describe = describe
+        self.cache_file = cache_file
+        self.tickers = None
+        self.tokens = None
+
+    def lookup(self, word):
+        """Return the sorted symbols matching a lower-cased word, tickers before descriptions."""
+        if self.tokens is None:
+            self._load_or_build()
+
+        matches = self.tickers.get(word) or self.tokens.get(word) or ()
+        return sorted(matches)
+
+    def update(self, added, removed, describe):
+        """
+        Apply a catalog diff. describe() must cover the added symbols; it is
+        only called if the index has already been built.
+        """
+        self.symbols.difference_update(removed)
+        self.symbols.update(added)
+        self.describe = describe
+        if self.tokens is None:
+            return
+
+        removed = set(removed)
+        for index in (self.tickers, self.tokens):
+            # Removals are rare, so a scan beats keeping a reverse map per symbol
+            for word in [word for word, matches in index.items() if not matches.isdisjoint(removed)]:
+                index[word] -= removed
+                if not index[word]:
+                    del index[word]
+
+        descriptions = describe() if added else {}
+        for symbol in added:
+            self._add(symbol, descriptions.get(symbol))
+        # The on-disk cache is not rewritten here: the next full load rebuilds it for the new catalog
+
+    def _add(self, symbol, description):
+        ticker = symbol.split(".", 1)[0].lower()
+        self.tickers.setdefault(ticker, set()).add(symbol)
+        for token in set(_WORD_PATTERN.findall((description or "").lower())):
+            self.tokens.setdefault(token, set()).add(symbol)
+
+    def _load_or_build(self):
+        descriptions = self.describe()
+        catalog_key = _catalog_key(self.symbols, descriptions)
+        if self._load_cache(catalog_key):
+            return
+
+        self.tickers = {}
+        self.tokens = {}
+        for symbol in self.symbols:
+            self._add(symbol, descriptions.get(symbol))
+
+        self._save_cache(catalog_key)
+
+    def _load_cache(self, catalog_key):
+        if not self.cache_file or not os.path.exists(self.cache_file):
+            return False
+        try:
+            with open(self.cache_file, "r") as f:
+                cached = json.load(f)
+            if cached.get("catalog") != catalog_key:
+                return False
+            self.tickers = {k: set(v) for k, v in cached["tickers"].items()}
+            self.tokens = {k: set(v) for k, v in cached["tokens"].items()}
+            return True
+        except Exception as e:
+            log.warning(f"Error loading symbol description cache: {str(e)}")
+            return False
+
+    def _save_cache(self, catalog_key):
+        if not self.cache_file:
+            return
+        data = {
+            "catalog": catalog_key,
+            "tickers": {k: sorted(v) for k, v in self.tickers.items()},
+            "tokens": {k: sorted(v) for k, v in self.tokens.items()},
+        }
+        try:
+            temp_file = f"{self.cache_file}.tmp"
+            with open(temp_file, "w") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(temp_file, self.cache_file)
+        except Exception as e:
+            log.warning(f"Error saving symbol description cache: {str(e)}")
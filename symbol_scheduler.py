@@ -0,0 +1,55 @@
+"""
+Per-symbol execution queues for signals.
+
+Signals for the same symbol run strictly one after another, in arrival
+order, so a ladder never interleaves with another on the same instrument.
+Signals for different symbols run concurrently, up to max_concurrent at a
+time, instead of queueing behind whichever ladder arrived first.
+"""
+
+import asyncio
+import time
+from collections import Counter
+
+
+class SymbolScheduler:
+    """FIFO lock per symbol plus a shared limit on concurrently running symbols."""
+
+    def __init__(self, max_concurrent=4, metrics=None):
+        self.max_concurrent = max(1, int(max_concurrent))
+        self.metrics = metrics
+        self._locks = {}  # symbol -> asyncio.Lock, only while it has queued or running work
+        self._depths = Counter()  # symbol -> queued + running signals
+        self._slots = None  # (event loop, asyncio.Semaphore)
+
+    def _semaphore(self):
+        # asyncio primitives belong to one event loop; replays and benchmarks run several
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._slots[0] is not loop:
+            self._slots = (loop, asyncio.Semaphore(self.max_concurrent))
+        return self._slots[1]
+
+    async def run(self, symbol, fn, *args, **kwargs):
+        """Await fn(*args, **kwargs) once every earlier signal for symbol has finished."""
+        queued = time.perf_counter()
+        self._depths[symbol] += 1
+        lock = self._locks.setdefault(symbol, asyncio.Lock())
+        try:
+            async with lock:
+                async with self._semaphore():
+                    if self.metrics:
+                        self.metrics.observe("symbol_queue_wait", time.perf_counter() - queued)
+                    return await fn(*args, **kwargs)
+        finally:
+            self._depths[symbol] -= 1
+            if not self._depths[symbol]:
+                del self._depths[symbol]
+                self._locks.pop(symbol, None)
+
+    def depths(self):
+        """Signals queued or running per symbol."""
+        return dict(self._depths)
+
+    def active(self):
+        """Number of symbols with queued or running signals."""
+        return len(self._depths)
@@ -0,0 +1,220 @@
+"""
+Compact store of static contract specifications for every symbol.
+
+Fields are kept as NumPy columns indexed by symbol id rather than as one
+SymbolInfo tuple per symbol, so the whole catalog costs a few bytes per field.
+The catalog can be snapshotted to disk and memory-mapped back on start-up.
+"""
+
+import os
+import sys
+
+import numpy as np
+
+# Column name -> dtype; names match the MT5 SymbolInfo fields they are read from
+SPEC_FIELDS = {
+    "digits": np.int32,
+    "point": np.float64,
+    "trade_tick_size": np.float64,
+    "trade_contract_size": np.float64,
+    "trade_tick_value": np.float64,
+    "volume_min": np.float64,
+    "volume_max": np.float64,
+    "volume_step": np.float64,
+    "trade_stops_level": np.int32,
+    "trade_freeze_level": np.int32,
+    "trade_mode": np.int32,
+}
+
+# Fields a broker can change on a listed symbol (around news, rollover or a
+# halt); the periodic catalog diff re-reads them for symbols it already has
+TRADING_RULE_FIELDS = ("trade_stops_level", "trade_freeze_level", "trade_mode")
+
+
+class SymbolSpec:
+    """Lightweight view of one row of a SpecStore, read like a SymbolInfo."""
+
+    __slots__ = ("name", "_columns", "_id")
+
+    def __init__(self, name, columns, symbol_id):
+        self.name = name
+        self._columns = columns
+        self._id = symbol_id
+
+    def __getattr__(self, field):
+        try:
+            column = self._columns[field]
+        except KeyError:
+            raise AttributeError(field) from None
+        return column[self._id].item()
+
+
+class SpecStore:
+    """
+    Static contract specs filled from mt5.symbols_get().
+
+    These fields rarely change intraday, except trade_tick_value on cross
+    pairs which drifts with the exchange rate and the stops/freeze levels and
+    trade mode which a broker can change around news; call refresh() to reload.
+    """
+
+    def __init__(self):
+        columns = {field: np.empty(0, dtype=dtype) for field, dtype in SPEC_FIELDS.items()}
+        self._state = ({}, [], columns)
+
+    def refresh(self, symbols):
+        """Rebuild the store from a sequence of SymbolInfo records."""
+        symbols = list(symbols or ())
+        names = [symbol.name for symbol in symbols]
+        ids = {name: symbol_id for symbol_id, name in enumerate(names)}
+        columns = {
+            field: np.fromiter(
+                (getattr(symbol, field) for symbol in symbols), dtype=dtype, count=len(symbols)
+            )
+            for field, dtype in SPEC_FIELDS.items()
+        }
+
+        # Swap in one assignment so readers never see a half-built store
+        self._state = (ids, names, columns)
+        return len(names)
+
+    def update(self, added, removed):
+        """
+        Apply a catalog diff: append rows for the added SymbolInfo records and
+        drop the removed names from the index. Removed rows stay in the columns
+        until the next refresh() compacts them.
+        """
+        ids, names, columns = self._state
+        ids = dict(ids)
+        for name in removed:
+            ids.pop(name, None)
+        names = list(names)
+        for symbol in added:
+            ids[symbol.name] = len(names)
+            names.append(symbol.name)
+        if added:
+            columns = {
+                field: np.concatenate(
+                    [columns[field], np.fromiter((getattr(symbol, field) for symbol in added), dtype=dtype)]
+                )
+                for field, dtype in SPEC_FIELDS.items()
+            }
+
+        self._state = (ids, names, columns)
+        return len(ids)
+
+    def update_fields(self, symbols, fields=TRADING_RULE_FIELDS):
+        """
+        Overwrite fields of rows already in the store from fresh SymbolInfo
+        records. Returns the names whose values changed.
+        """
+        ids, names, columns = self._state
+        known = [symbol for symbol in symbols if symbol.name in ids]
+        rows = np.fromiter((ids[symbol.name] for symbol in known), dtype=np.intp, count=len(known))
+        changed = np.zeros(len(known), dtype=bool)
+        fresh = {}
+        for field in fields:
+            values = np.fromiter(
+                (getattr(symbol, field) for symbol in known), dtype=SPEC_FIELDS[field], count=len(known)
+            )
+            changed |= columns[field][rows] != values
+            fresh[field] = values
+        if not changed.any():
+            return []
+
+        # Copy rather than write in place: snapshot columns are read-only memory maps
+        columns = dict(columns)
+        for field, values in fresh.items():
+            column = np.array(columns[field])
+            column[rows] = values
+            columns[field] = column
+        self._state = (ids, names, columns)
+        return [known[i].name for i in np.flatnonzero(changed)]
+
+    def load_snapshot(self, records):
+        """Serve specs straight from a (memory-mapped) snapshot from read_snapshot()."""
+        names = [name.decode("utf-8") for name in records["name"].tolist()]
+        ids = {name: symbol_id for symbol_id, name in enumerate(names)}
+        columns = {field: records[field] for field in SPEC_FIELDS}
+        self._state = (ids, names, columns)
+        return len(names)
+
+    @property
+    def names(self):
+        """Names of the symbols in the store, in row order."""
+        return list(self._state[0])
+
+    @property
+    def columns(self):
+        return self._state[2]
+
+    def get(self, symbol):
+        """Return the SymbolSpec for a symbol, or None if it is not in the catalog."""
+        ids, _, columns = self._state
+        symbol_id = ids.get(symbol)
+        if symbol_id is None:
+            return None
+        return SymbolSpec(symbol, columns, symbol_id)
+
+    def memory_usage(self):
+        """Approximate bytes used by the columns and the name index."""
+        ids, names, columns = self._state
+        column_bytes = sum(column.nbytes for column in columns.values())
+        index_bytes = sys.getsizeof(ids) + sys.getsizeof(names)
+        index_bytes += sum(sys.getsizeof(name) for name in names)
+        return column_bytes + index_bytes
+
+    def __contains__(self, symbol):
+        return symbol in self._state[0]
+
+    def __len__(self):
+        return len(self._state[0])
+
+
+def write_snapshot(path, symbols):
+    """
+    Write names, descriptions and spec fields of a catalog to one structured
+    .npy file (temp file, fsync, atomic rename) for read_snapshot() to map.
+    """
+    symbols = list(symbols or ())
+    names = [symbol.name.encode("utf-8") for symbol in symbols]
+    descriptions = [(symbol.description or "").encode("utf-8") for symbol in symbols]
+    dtype = [
+        ("name", f"S{max(map(len, names), default=1)}"),
+        ("description", f"S{max(map(len, descriptions), default=1)}"),
+    ] + list(SPEC_FIELDS.items())
+
+    records = np.empty(len(symbols), dtype=dtype)
+    records["name"] = names
+    records["description"] = descriptions
+    for field in SPEC_FIELDS:
+        records[field] = [getattr(symbol, field) for symbol in symbols]
+
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as f:
+        np.save(f, records)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+def read_snapshot(path):
+    """
+    Memory-map a snapshot written by write_snapshot(). Returns None if there
+    is none; raises ValueError if it was written with different fields.
+    """
+    if not os.path.exists(path):
+        return None
+    records = np.load(path, mmap_mode="r")
+    expected = {"name", "description", *SPEC_FIELDS}
+    if records.dtype.names is None or set(records.dtype.names) != expected:
+        raise ValueError(f"{path} does not match the current spec fields")
+    return records
+
+
+def snapshot_descriptions(records):
+    """Return {symbol: description} from a snapshot."""
+    return {
+        name.decode("utf-8"): description.decode("utf-8")
+        for name, description in zip(records["name"].tolist(), records["description"].tolist())
+    }